@@ -17,6 +17,8 @@ Algorithm:
 
 from __future__ import annotations
 
+import operator
+
 from app.agents.base import BaseAgent
 from app.schemas.state import TravelGraphState
 from app.schemas.travel import CostBreakdown
@@ -38,6 +40,14 @@ _MIN_SHARE = {
     'activities_estimated': 0.25,    # many free alternatives
 }
 
+# Fetches all four cost buckets in one C-level call (used by _sum)
+_BUCKETS = operator.attrgetter(
+    'flights_estimated',
+    'accommodation_estimated',
+    'activities_estimated',
+    'transport_estimated',
+)
+
 
 class BudgetOptimizerAgent(BaseAgent):
     name = 'BudgetOptimizerAgent'
@@ -57,58 +67,37 @@ class BudgetOptimizerAgent(BaseAgent):
 
         rounds = 0
 
-        # ── 2. Proportional budget fitting ─────────────────────────────
+        # ── 2. Closed-form proportional budget fitting ─────────────────
+        # Single water-filling pass: every bucket gives back a share of
+        # the overshoot proportional to its headroom above its floor.
+        # Infeasible budgets clamp every bucket straight to its floor, so
+        # propagation runs exactly once either way.
         if budget_max and budget_max > 0 and cb.total_estimated > budget_max:
             overshoot = cb.total_estimated - budget_max
 
-            # Build flexibility pool: how much each bucket CAN give back
-            pool: list[tuple[str, float]] = []
-            for cat in _FLEX_ORDER:
-                original = getattr(cb, cat)
-                floor = original * _MIN_SHARE[cat]
-                headroom = original - floor
-                if headroom > 0:
-                    pool.append((cat, headroom))
-
-            total_headroom = sum(h for _, h in pool)
+            originals = {cat: getattr(cb, cat) for cat in _FLEX_ORDER}
+            floors = {cat: originals[cat] * _MIN_SHARE[cat] for cat in _FLEX_ORDER}
+            headrooms = {cat: originals[cat] - floors[cat] for cat in _FLEX_ORDER}
+            total_headroom = sum(headrooms.values())
 
             if total_headroom > 0:
-                # Distribute reduction proportionally across flexible buckets
-                scale = min(overshoot / total_headroom, 1.0)
-                reductions: dict[str, float] = {}
-                for cat, headroom in pool:
-                    reduction = round(headroom * scale, 2)
-                    reductions[cat] = reduction
-                    setattr(cb, cat, getattr(cb, cat) - reduction)
+                if overshoot >= total_headroom:
+                    # Even the floors overshoot — clamp everything down.
+                    for cat in _FLEX_ORDER:
+                        setattr(cb, cat, round(floors[cat], 2))
+                else:
+                    scale = overshoot / total_headroom
+                    for cat in _FLEX_ORDER:
+                        reduction = round(headrooms[cat] * scale, 2)
+                        setattr(cb, cat, originals[cat] - reduction)
                 rounds = 1
 
-                # Propagate reductions back to artefacts
+                # Propagate reductions back to artefacts (once)
                 self._propagate_accommodation(state, cb)
                 self._propagate_activities(state, cb)
-            else:
-                rounds = 0
 
             cb.total_estimated = self._sum(cb)
 
-            # Second pass: if still over, do a hard trim
-            if cb.total_estimated > budget_max:
-                remaining = cb.total_estimated - budget_max
-                for cat in ['activities_estimated', 'accommodation_estimated', 'transport_estimated']:
-                    if remaining <= 0:
-                        break
-                    current = getattr(cb, cat)
-                    floor = current * 0.20
-                    can_cut = current - floor
-                    cut = min(can_cut, remaining)
-                    if cut > 0:
-                        setattr(cb, cat, current - cut)
-                        remaining -= cut
-                        rounds += 1
-
-                self._propagate_accommodation(state, cb)
-                self._propagate_activities(state, cb)
-                cb.total_estimated = self._sum(cb)
-
         state['total_cost'] = cb.total_estimated
 
         # ── 3. Optimisation score ──────────────────────────────────────
@@ -144,13 +133,7 @@ class BudgetOptimizerAgent(BaseAgent):
 
     @staticmethod
     def _sum(cb: CostBreakdown) -> float:
-        return round(
-            cb.flights_estimated
-            + cb.accommodation_estimated
-            + cb.activities_estimated
-            + cb.transport_estimated,
-            2,
-        )
+        return round(sum(_BUCKETS(cb)), 2)
 
     @staticmethod
     def _propagate_accommodation(state: TravelGraphState, cb: CostBreakdown) -> None:
@@ -158,12 +141,9 @@ class BudgetOptimizerAgent(BaseAgent):
         stays = state.get('stay_recommendations', [])
         if not stays:
             return
-        intent = state['intent']
-        n_dest = len(stays)
-        duration = intent.duration_days
-        base_nights = duration // n_dest
-        remainder = duration % n_dest
-        total_nights = sum(base_nights + (1 if i < remainder else 0) for i in range(n_dest))
+        # Nights are a partition of the trip, so they always sum to the
+        # trip duration — no need to rebuild the per-city split here.
+        total_nights = state['intent'].duration_days
         if total_nights > 0:
             per_night = cb.accommodation_estimated / total_nights
             for s in stays:
@@ -15,7 +15,12 @@ Production-grade improvements:
 
 from __future__ import annotations
 
-import math
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
 from app.agents.base import BaseAgent
 from app.schemas.state import TravelGraphState
 from app.schemas.travel import CarbonFootprint, CarbonLeg
@@ -110,34 +115,85 @@ _COORDS: dict[str, tuple[float, float]] = {
 }
 
 
-def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Great-circle distance in km between two points."""
-    R = 6371.0
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (math.sin(dlat / 2) ** 2
-         + math.cos(math.radians(lat1))
-         * math.cos(math.radians(lat2))
-         * math.sin(dlon / 2) ** 2)
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+# Default distance when neither the pair table nor the coordinate table
+# knows a city: moderate international estimate.
+_DEFAULT_DISTANCE_KM = 3500.0
+
+_EARTH_RADIUS_KM = 6371.0
+
+
+def _haversine_vec(lat_rad: np.ndarray, lon_rad: np.ndarray) -> np.ndarray:
+    """All-pairs great-circle distances in km for pre-radianed coordinates.
+
+    One vectorized ``np.arctan2`` call covers the whole NxN grid.
+    """
+    cos_lat = np.cos(lat_rad)
+    dlat = lat_rad[:, None] - lat_rad[None, :]
+    dlon = lon_rad[:, None] - lon_rad[None, :]
+    a = (np.sin(dlat / 2) ** 2
+         + cos_lat[:, None] * cos_lat[None, :] * np.sin(dlon / 2) ** 2)
+    return _EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _build_distance_matrix() -> tuple[dict[str, int], np.ndarray]:
+    """Fuse ``_DISTANCE_KM`` and the Haversine fallback into one dense table.
+
+    Runtime lookup becomes a single ``_DIST[i, j]`` indexed load — no
+    direction check, no nested-dict hashing, no trig.  N≈40 cities keeps
+    the float32 matrix a few KB, trivially cache-resident.
+    """
+    cities = sorted(
+        set(_COORDS)
+        | set(_DISTANCE_KM)
+        | {d for pairs in _DISTANCE_KM.values() for d in pairs}
+    )
+    # Interned keys make the dict probe an identity compare for
+    # canonical-form callers.
+    index = {sys.intern(city): i for i, city in enumerate(cities)}
+    n = len(cities)
+
+    dist = np.full((n, n), _DEFAULT_DISTANCE_KM, dtype=np.float32)
+    np.fill_diagonal(dist, 0.0)
+
+    # Haversine fill for every pair with known coordinates
+    with_coords = [c for c in cities if c in _COORDS]
+    idx = np.array([index[c] for c in with_coords])
+    coords_rad = np.radians(np.array([_COORDS[c] for c in with_coords]))
+    hav = np.round(_haversine_vec(coords_rad[:, 0], coords_rad[:, 1]), 0)
+    dist[np.ix_(idx, idx)] = hav
+    np.fill_diagonal(dist, 0.0)
+
+    # Curated pair table wins over the great-circle estimate, both directions
+    for origin, pairs in _DISTANCE_KM.items():
+        i = index[origin]
+        for dest, km in pairs.items():
+            j = index[dest]
+            dist[i, j] = km
+            dist[j, i] = km
+
+    return index, dist
+
+
+_IDX, _DIST = _build_distance_matrix()
+
+
+@lru_cache(maxsize=512)
+def _norm(city: str) -> int:
+    """Matrix index for a raw city string, or -1 if unknown.
+
+    Cached so the per-call ``.lower().strip()`` and dict probe are paid
+    once per distinct raw string — the same origin recurs on every leg.
+    """
+    return _IDX.get(sys.intern(city.lower().strip()), -1)
 
 
 def _get_distance(origin: str, dest: str) -> float:
     """Get approximate distance in km between two cities."""
-    o = origin.lower().strip()
-    d = dest.lower().strip()
-    if o == d:
-        return 0.0
-    # Check lookup table both directions
-    if o in _DISTANCE_KM and d in _DISTANCE_KM[o]:
-        return _DISTANCE_KM[o][d]
-    if d in _DISTANCE_KM and o in _DISTANCE_KM[d]:
-        return _DISTANCE_KM[d][o]
-    # Haversine fallback if both cities are in coordinate table
-    if o in _COORDS and d in _COORDS:
-        return round(_haversine(*_COORDS[o], *_COORDS[d]), 0)
-    # Last resort: moderate international estimate
-    return 3500.0
+    i = _norm(origin)
+    j = _norm(dest)
+    if i < 0 or j < 0:
+        return 0.0 if origin.lower().strip() == dest.lower().strip() else _DEFAULT_DISTANCE_KM
+    return float(_DIST[i, j])
 
 
 # CO₂ emission factors (kg CO₂ per passenger-km)
@@ -155,29 +211,42 @@ _EMISSION_FACTORS = {
 _OFFSET_RATE_INR_PER_KG = 1.2
 
 
+# Band edges for factor / rating lookups — searchsorted picks the bucket
+# with one binary probe instead of an if/elif chain.
+_FACTOR_BANDS = np.array([1500.0, 3500.0])
+_FACTOR_VALS = np.array([
+    _EMISSION_FACTORS['flight_short'],
+    _EMISSION_FACTORS['flight_medium'],
+    _EMISSION_FACTORS['flight_long'],
+])
+_RATING_BANDS = np.array([200.0, 600.0, 1200.0])
+_RATING_VALS = ('low', 'moderate', 'high', 'very high')
+
+
 def _emission_factor(distance_km: float) -> float:
-    if distance_km < 1500:
-        return _EMISSION_FACTORS['flight_short']
-    elif distance_km < 3500:
-        return _EMISSION_FACTORS['flight_medium']
-    return _EMISSION_FACTORS['flight_long']
+    return float(_FACTOR_VALS[np.searchsorted(_FACTOR_BANDS, distance_km, side='right')])
 
 
 def _carbon_rating(total_kg: float) -> str:
     """Rate the trip's carbon footprint."""
-    if total_kg < 200:
-        return 'low'
-    elif total_kg < 600:
-        return 'moderate'
-    elif total_kg < 1200:
-        return 'high'
-    return 'very high'
+    return _RATING_VALS[np.searchsorted(_RATING_BANDS, total_kg, side='right')]
+
+
+# Lightweight internal leg record — cached results hold these instead of
+# Pydantic models, so hits skip validation and cannot alias shared models.
+_LegRaw = namedtuple('_LegRaw', 'leg mode distance_km co2_kg')
 
 
-def _generate_tips(legs: list[CarbonLeg], rating: str) -> list[str]:
+def _generate_tips(legs: list[_LegRaw], rating: str) -> list[str]:
     """Generate actionable carbon reduction tips."""
+    # Single pass over the legs gathers every signal the tips depend on
+    has_short_flight = False
+    for l in legs:
+        if l.mode == 'flight' and l.distance_km < 800:
+            has_short_flight = True
+            break
+
     tips = []
-    has_short_flight = any(l.distance_km < 800 for l in legs if l.mode == 'flight')
     if has_short_flight:
         tips.append('Consider trains for short-haul legs under 800 km — up to 80% less CO₂')
     if rating in ('high', 'very high'):
@@ -190,69 +259,90 @@ def _generate_tips(legs: list[CarbonLeg], rating: str) -> list[str]:
     return tips
 
 
+@lru_cache(maxsize=256)
+def _compute_footprint(
+    origin: str,
+    destinations: tuple[str, ...],
+    travelers: int,
+    duration_days: int,
+) -> tuple[float, tuple[_LegRaw, ...], str, tuple[str, ...], int]:
+    """Pure footprint math, memoized on the trip shape.
+
+    Repeated planning turns with the same origin/destinations/party reuse
+    the cached bundle instead of redoing the distance and emission work.
+    """
+    legs: list[_LegRaw] = []
+    total_co2 = 0.0
+
+    # Batch all flight legs (outbound hops + return) through the
+    # distance matrix in one vectorized gather instead of per-leg
+    # scalar lookups.
+    if destinations:
+        chain = [origin, *destinations, origin]
+        idx = np.array([_norm(c) for c in chain])
+        src, dst = idx[:-1], idx[1:]
+        dists = _DIST[src, dst].astype(np.float64)
+        # Unknown cities fall back to the default estimate, except a
+        # leg from a city to itself which is zero-distance.
+        unknown = (src < 0) | (dst < 0)
+        if unknown.any():
+            same = np.array([
+                a.lower().strip() == b.lower().strip()
+                for a, b in zip(chain[:-1], chain[1:])
+            ])
+            dists[unknown] = np.where(same[unknown], 0.0, _DEFAULT_DISTANCE_KM)
+        factors = _FACTOR_VALS[np.searchsorted(_FACTOR_BANDS, dists, side='right')]
+        co2_raw = dists * factors * travelers
+        co2s = np.round(co2_raw, 1)
+        for a, b, dist, co2 in zip(chain[:-1], chain[1:], dists, co2s):
+            legs.append(_LegRaw(
+                leg=f'{a.title()} → {b.title()}',
+                mode='flight',
+                distance_km=round(float(dist)),
+                co2_kg=float(co2),
+            ))
+        total_co2 += float(co2_raw.sum())
+
+    # Add local transport estimate (buses, metro, etc.)
+    local_co2 = duration_days * 5.5 * travelers  # ~5.5 kg/day avg
+    if local_co2 > 0:
+        legs.append(_LegRaw(
+            leg='Local transport (all destinations)',
+            mode='bus',
+            distance_km=round(duration_days * 40),  # ~40 km/day
+            co2_kg=round(local_co2, 1),
+        ))
+        total_co2 += local_co2
+
+    # Round once, from the unrounded sum — per-leg rounding is display
+    # only and no longer feeds the total, so legs and total cannot drift.
+    total_co2 = round(total_co2, 1)
+    rating = _carbon_rating(total_co2)
+    tips = _generate_tips(legs, rating)
+    offset_cost = round(total_co2 * _OFFSET_RATE_INR_PER_KG)
+
+    return total_co2, tuple(legs), rating, tuple(tips), offset_cost
+
+
 class CarbonFootprintAgent(BaseAgent):
     name = 'CarbonFootprintAgent'
 
     async def run(self, state: TravelGraphState) -> TravelGraphState:
         intent = state['intent']
-        origin = intent.origin_city or 'Delhi'
-        destinations = intent.destinations or []
-        travelers = intent.traveler_count
-
-        legs: list[CarbonLeg] = []
-        total_co2 = 0.0
-
-        # Calculate for each flight leg
-        prev = origin
-        for dest in destinations:
-            dist = _get_distance(prev, dest)
-            factor = _emission_factor(dist)
-            co2 = round(dist * factor * travelers, 1)
-            legs.append(CarbonLeg(
-                leg=f'{prev.title()} → {dest.title()}',
-                mode='flight',
-                distance_km=round(dist),
-                co2_kg=co2,
-            ))
-            total_co2 += co2
-            prev = dest
-
-        # Return leg
-        if destinations:
-            dist = _get_distance(destinations[-1], origin)
-            factor = _emission_factor(dist)
-            co2 = round(dist * factor * travelers, 1)
-            legs.append(CarbonLeg(
-                leg=f'{destinations[-1].title()} → {origin.title()}',
-                mode='flight',
-                distance_km=round(dist),
-                co2_kg=co2,
-            ))
-            total_co2 += co2
-
-        # Add local transport estimate (buses, metro, etc.)
-        local_days = intent.duration_days
-        local_co2 = round(local_days * 5.5 * travelers, 1)  # ~5.5 kg/day avg
-        if local_co2 > 0:
-            legs.append(CarbonLeg(
-                leg='Local transport (all destinations)',
-                mode='bus',
-                distance_km=round(local_days * 40),  # ~40 km/day
-                co2_kg=local_co2,
-            ))
-            total_co2 += local_co2
 
-        total_co2 = round(total_co2, 1)
-        rating = _carbon_rating(total_co2)
-        tips = _generate_tips(legs, rating)
-        offset_cost = round(total_co2 * _OFFSET_RATE_INR_PER_KG)
+        total_co2, legs, rating, tips, offset_cost = _compute_footprint(
+            intent.origin_city or 'Delhi',
+            tuple(intent.destinations or ()),
+            intent.traveler_count,
+            intent.duration_days,
+        )
 
         state['carbon_footprint'] = CarbonFootprint(
             total_co2_kg=total_co2,
             rating=rating,
             offset_cost_inr=offset_cost,
-            legs=legs,
-            tips=tips,
+            legs=[CarbonLeg(**l._asdict()) for l in legs],
+            tips=list(tips),
         )
 
         self.log(
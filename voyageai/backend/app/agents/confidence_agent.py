@@ -15,10 +15,46 @@ Production-grade improvements:
 
 from __future__ import annotations
 
+import numpy as np
+
 from app.agents.base import BaseAgent
 from app.schemas.state import TravelGraphState
 from app.schemas.travel import ConfidenceScores
 
+# Weights for the overall score, in the order the per-agent scores are
+# assembled below: intent, route, flight, hotel, activity, budget, risk.
+_WEIGHTS = np.array([0.20, 0.15, 0.15, 0.15, 0.15, 0.10, 0.10])
+
+# Bonus vectors for each rubric.  Each subsection score is
+# ``base + bonuses @ mask`` where the mask is a boolean vector of data
+# quality signals — table-driven instead of an if-cascade per signal.
+_INTENT_BONUS = np.array([0.15, 0.10, 0.07, 0.05, 0.04, 0.04])
+_ROUTE_BONUS = np.array([0.15, 0.08, 0.07, 0.05])
+_FLIGHT_BONUS = np.array([0.15, 0.10, 0.10, -0.10])
+_HOTEL_BONUS = np.array([0.15, 0.10, 0.10, 0.05])
+_BUDGET_BONUS = np.array([0.15, 0.15, 0.08, 0.10, 0.05])
+_RISK_BONUS = np.array([0.10, 0.10, 0.08, 0.07])
+
+
+def _good_variety(itinerary) -> bool:
+    """True when more than 70% of scheduled activities are unique.
+
+    Streams through the days and exits as soon as the unique count
+    clears the threshold — the count is monotone, so no need to finish
+    the scan (or materialize the full activity list) once it does.
+    """
+    total = sum(len(d.activities) for d in itinerary)
+    if total == 0:
+        return False
+    threshold = 0.7 * total
+    seen: set[str] = set()
+    for d in itinerary:
+        for a in d.activities:
+            seen.add(a)
+            if len(seen) > threshold:
+                return True
+    return False
+
 
 class ConfidenceAgent(BaseAgent):
     name = 'ConfidenceAgent'
@@ -28,132 +64,116 @@ class ConfidenceAgent(BaseAgent):
         scores = ConfidenceScores()
 
         # ── Intent Parsing confidence ─────────────────────────────────
-        intent_score = 0.55  # base: we always parse something
-        if intent.destinations:
-            intent_score += 0.15
-        if intent.budget_total_inr or (intent.budget_range_inr and intent.budget_range_inr.max):
-            intent_score += 0.10
-        if intent.travel_month:
-            intent_score += 0.07
-        if intent.origin_city:
-            intent_score += 0.05
-        if intent.trip_type and intent.trip_type != 'general':
-            intent_score += 0.04
-        if intent.interests and len(intent.interests) >= 2:
-            intent_score += 0.04
+        intent_mask = np.array([
+            bool(intent.destinations),
+            bool(intent.budget_total_inr
+                 or (intent.budget_range_inr and intent.budget_range_inr.max)),
+            bool(intent.travel_month),
+            bool(intent.origin_city),
+            bool(intent.trip_type and intent.trip_type != 'general'),
+            bool(intent.interests and len(intent.interests) >= 2),
+        ])
+        intent_score = 0.55 + float(_INTENT_BONUS @ intent_mask)
         scores.intent_parsing = round(min(intent_score, 1.0), 2)
 
         # ── Route Planning confidence ─────────────────────────────────
         itinerary = state.get('day_by_day_itinerary', [])
-        route_score = 0.65
-        if len(itinerary) == intent.duration_days:
-            route_score += 0.15  # exact day count match
-        if state.get('route_strategy'):
-            route_score += 0.08
-        if state.get('transport_plan') and state['transport_plan'].route_order:
-            route_score += 0.07
-        # Bonus: every day has a city assigned
-        if itinerary and all(d.city for d in itinerary):
-            route_score += 0.05
+        route_mask = np.array([
+            len(itinerary) == intent.duration_days,  # exact day count match
+            bool(state.get('route_strategy')),
+            bool(state.get('transport_plan') and state['transport_plan'].route_order),
+            # every day has a city assigned
+            bool(itinerary and all(d.city for d in itinerary)),
+        ])
+        route_score = 0.65 + float(_ROUTE_BONUS @ route_mask)
         scores.route_planning = round(min(route_score, 1.0), 2)
 
         # ── Flight Data confidence ────────────────────────────────────
         flights = state.get('flight_options', [])
-        flight_score = 0.60
-        if flights:
-            flight_score += 0.15
-            if len(flights) >= 3:
-                flight_score += 0.10
-            prices = [f.get('price_inr', 0) for f in flights if f.get('price_inr', 0) > 0]
-            if prices:
-                spread = (max(prices) - min(prices)) / max(prices) if max(prices) > 0 else 0
-                if spread > 0.15:
-                    flight_score += 0.10  # good price diversity
-                # Penalty: any negative / zero prices
-                if any(p <= 0 for p in prices):
-                    flight_score -= 0.10
+        prices = [f.get('price_inr', 0) for f in flights if f.get('price_inr', 0) > 0]
+        spread = (max(prices) - min(prices)) / max(prices) if prices and max(prices) > 0 else 0
+        flight_mask = np.array([
+            bool(flights),
+            len(flights) >= 3,
+            spread > 0.15,                     # good price diversity
+            any(p <= 0 for p in prices),       # penalty: negative / zero prices
+        ])
+        flight_score = 0.60 + float(_FLIGHT_BONUS @ flight_mask)
         scores.flight_data = round(min(max(flight_score, 0.0), 1.0), 2)
 
         # ── Hotel Data confidence ─────────────────────────────────────
         hotels = state.get('hotel_options', [])
-        hotel_score = 0.60
-        if hotels:
-            hotel_score += 0.15
-            if len(hotels) >= 4:
-                hotel_score += 0.10
-            if state.get('stay_recommendations'):
-                recs = state['stay_recommendations']
-                hotel_score += 0.10
-                # Bonus: recommendations have city + budget info
-                if recs and all(
-                    getattr(r, 'city', None) and getattr(r, 'budget_per_night_inr', 0) > 0
-                    for r in recs
-                ):
-                    hotel_score += 0.05
+        recs = state.get('stay_recommendations') if hotels else None
+        hotel_mask = np.array([
+            bool(hotels),
+            len(hotels) >= 4,
+            bool(recs),
+            # recommendations have city + budget info
+            bool(recs and all(
+                getattr(r, 'city', None) and getattr(r, 'budget_per_night_inr', 0) > 0
+                for r in recs
+            )),
+        ])
+        hotel_score = 0.60 + float(_HOTEL_BONUS @ hotel_mask)
         scores.hotel_data = round(min(hotel_score, 1.0), 2)
 
         # ── Activity Data confidence ──────────────────────────────────
-        act_score = 0.60
         days_with_activities = sum(1 for d in itinerary if d.activities)
         total_days = len(itinerary)
-        if total_days > 0 and days_with_activities == total_days:
-            act_score += 0.20  # full coverage
-        elif days_with_activities > 0:
+        full_coverage = total_days > 0 and days_with_activities == total_days
+        act_mask = np.array([
+            full_coverage,
+            bool(state.get('experiences') and len(state['experiences']) > 3),
+            bool(state.get('remote_work_spots')),
+            _good_variety(itinerary),  # few duplicate activities across days
+        ])
+        act_score = 0.60 + float(np.array([0.20, 0.10, 0.05, 0.05]) @ act_mask)
+        if not full_coverage and days_with_activities > 0:
+            # partial coverage earns a proportional share of the bonus
             act_score += 0.10 * (days_with_activities / max(total_days, 1))
-        if state.get('experiences') and len(state['experiences']) > 3:
-            act_score += 0.10
-        if state.get('remote_work_spots'):
-            act_score += 0.05
-        # Check for duplicate activities across days
-        all_acts = [a for d in itinerary for a in d.activities]
-        unique_ratio = len(set(all_acts)) / max(len(all_acts), 1)
-        if unique_ratio > 0.7:
-            act_score += 0.05  # good variety
         scores.activity_data = round(min(act_score, 1.0), 2)
 
         # ── Budget Optimization confidence ────────────────────────────
-        budget_score = 0.60
         cb = state.get('cost_breakdown')
-        if cb and cb.total_estimated > 0:
-            budget_score += 0.15
+        has_total = bool(cb and cb.total_estimated > 0)
+        ratio = 0.0
+        if has_total:
             budget_max = intent.budget_range_inr.max or intent.budget_total_inr
             if budget_max and budget_max > 0:
                 ratio = cb.total_estimated / budget_max
-                if 0.75 <= ratio <= 1.05:
-                    budget_score += 0.15  # within tight range
-                elif 0.6 <= ratio <= 1.15:
-                    budget_score += 0.08  # within acceptable range
+        tight = 0.75 <= ratio <= 1.05
         opt_score = state.get('optimization_score', 0)
-        if opt_score >= 8:
-            budget_score += 0.10
-        elif opt_score >= 6:
-            budget_score += 0.05
+        budget_mask = np.array([
+            has_total,
+            tight,                                       # within tight range
+            not tight and 0.6 <= ratio <= 1.15,          # acceptable range
+            opt_score >= 8,
+            6 <= opt_score < 8,
+        ])
+        budget_score = 0.60 + float(_BUDGET_BONUS @ budget_mask)
         scores.budget_optimization = round(min(budget_score, 1.0), 2)
 
         # ── Risk Assessment confidence ────────────────────────────────
-        risk_conf = 0.65
-        if state.get('weather_data'):
-            risk_conf += 0.10
-        if state.get('visa_data'):
-            risk_conf += 0.10
-        if state.get('visa_information') and state['visa_information'].details:
-            risk_conf += 0.08
-        if state.get('risk_score') is not None:
-            risk_conf += 0.07
+        risk_mask = np.array([
+            bool(state.get('weather_data')),
+            bool(state.get('visa_data')),
+            bool(state.get('visa_information') and state['visa_information'].details),
+            state.get('risk_score') is not None,
+        ])
+        risk_conf = 0.65 + float(_RISK_BONUS @ risk_mask)
         scores.risk_assessment = round(min(risk_conf, 1.0), 2)
 
-        # ── Overall (weighted average) ────────────────────────────────
-        weights = {
-            'intent': (scores.intent_parsing, 0.20),
-            'route': (scores.route_planning, 0.15),
-            'flight': (scores.flight_data, 0.15),
-            'hotel': (scores.hotel_data, 0.15),
-            'activity': (scores.activity_data, 0.15),
-            'budget': (scores.budget_optimization, 0.10),
-            'risk': (scores.risk_assessment, 0.10),
-        }
-        overall = sum(score * weight for score, weight in weights.values())
-        scores.overall = round(overall, 2)
+        # ── Overall (weighted average — one dot product) ──────────────
+        scores_vec = np.array([
+            scores.intent_parsing,
+            scores.route_planning,
+            scores.flight_data,
+            scores.hotel_data,
+            scores.activity_data,
+            scores.budget_optimization,
+            scores.risk_assessment,
+        ])
+        scores.overall = round(float(_WEIGHTS @ scores_vec), 2)
 
         state['confidence_scores'] = scores
 
@@ -15,9 +15,12 @@ Production-grade improvements:
 
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+
 from app.agents.base import BaseAgent
 from app.schemas.state import TravelGraphState
-from app.tools.mock_apis import search_activities, get_daily_transport_cost, get_remote_work_spots
+from app.tools.mock_apis import search_activities_batch, get_daily_transport_cost, get_remote_work_spots
 from app.schemas.travel import RemoteWorkSpot
 
 
@@ -37,34 +40,57 @@ class ExperienceAgent(BaseAgent):
 
         # Caches keyed by canonical city name
         city_key = lambda c: c.strip().lower()
-        activity_cache: dict[str, list[dict]] = {}
+
+        # ── phase 1: fetch everything per unique city concurrently ──
+        # Activities go through the batched endpoint (one call per trip);
+        # transport and remote-work lookups overlap with it, so the fetch
+        # phase costs one round-trip of wall clock instead of 3×N.
+        unique_cities = {city_key(d.city): d.city for d in itinerary}
+        cities = list(unique_cities.values())
+        acts_by_city, transports, spot_lists = await asyncio.gather(
+            search_activities_batch(cities),
+            asyncio.gather(*(get_daily_transport_cost(c) for c in cities)),
+            asyncio.gather(*(get_remote_work_spots(c) for c in cities)),
+        )
+        # Rank each city's pool once — the interest set is fixed for the
+        # whole run, so per-day re-sorting was pure repeat work.  Pools
+        # hold (name, type_lower, score, cost) tuples so ranking and
+        # selection never touch dict lookups or .lower() again.
+        def _sort_key(t: tuple) -> tuple:
+            return (1 if t[1] in interests else 0, t[2])
+
+        ranked_cache: dict[str, list[tuple]] = {}
         transport_cache: dict[str, float] = {}
         remote_cache: dict[str, list[dict]] = {}
+        for ck, city, transport, spots in zip(unique_cities, cities, transports, spot_lists):
+            acts = acts_by_city[city]
+            # Downstream only counts experiences / reads names, so keep a
+            # slim projection in state instead of retaining the full
+            # activity dicts for every city.
+            all_experiences.extend(
+                {'name': a['name'], 'type': a.get('type', '')} for a in acts
+            )
+            ranked_cache[ck] = sorted(
+                (
+                    (a['name'], a.get('type', '').lower(), a.get('score', 0), a.get('cost_inr', 0))
+                    for a in acts
+                ),
+                key=_sort_key,
+                reverse=True,
+            )
+            transport_cache[ck] = transport
+            remote_cache[ck] = spots
         seen_remote: set[str] = set()
 
-        # Track used activity names per city to eliminate cross-day duplicates
-        city_used: dict[str, set[str]] = {}
-        # Activity offset for deterministic rotation
-        city_offset: dict[str, int] = {}
+        # Per-city rotation pool: popping from the left walks the ranked
+        # list across days without re-scanning for used names; refilled
+        # when exhausted so long stays cycle back to the top picks.
+        city_pool: dict[str, deque] = {}
 
         for day_idx, day_item in enumerate(itinerary):
             city = day_item.city
             ck = city_key(city)
-
-            # ── fetch & cache activities ────────────────────────────
-            if ck not in activity_cache:
-                acts = await search_activities(city)
-                activity_cache[ck] = acts
-                all_experiences.extend(acts)
-
-            activities = activity_cache[ck]
-
-            # ── rank by interest overlap then by quality score ──────
-            def _sort_key(a: dict) -> tuple:
-                type_match = 1 if a.get('type', '').lower() in interests else 0
-                return (type_match, a.get('score', 0))
-
-            ranked = sorted(activities, key=_sort_key, reverse=True)
+            ranked = ranked_cache[ck]
 
             # ── decide how many activities this day ─────────────────
             is_arrival_day = (day_idx > 0 and
@@ -79,69 +105,52 @@ class ExperienceAgent(BaseAgent):
                 n_per_day = min(3, len(ranked)) if len(ranked) <= 4 else 3
 
             # ── pick activities with duplicate prevention ───────────
-            used_names = city_used.setdefault(ck, set())
-            offset = city_offset.get(ck, 0)
-            chosen: list[dict] = []
-
-            # First pass: pick unseen activities from offset position
-            pool_len = len(ranked)
-            for i in range(pool_len):
-                if len(chosen) >= n_per_day:
-                    break
-                idx = (offset + i) % pool_len
-                act = ranked[idx]
-                if act['name'] not in used_names:
-                    chosen.append(act)
-
-            # If we still need more (pool exhausted), allow repeats
-            # but pick highest-scored ones not already chosen today
-            chosen_names = {a['name'] for a in chosen}
-            if len(chosen) < n_per_day:
-                for act in ranked:
-                    if act['name'] not in chosen_names:
-                        chosen.append(act)
-                        chosen_names.add(act['name'])
-                        if len(chosen) >= n_per_day:
-                            break
-
-            # Update tracking
-            for a in chosen:
-                used_names.add(a['name'])
-            city_offset[ck] = offset + len(chosen)
-
-            # ── If ALL activities in the pool have been used,
-            #    reset so next cycle gets fresh picks ────────────────
-            if len(used_names) >= pool_len:
-                city_used[ck] = set()
+            # Pools rotate ranked *indices*; "already scheduled today"
+            # is an int bitmask over those indices, so the inner loop
+            # does bit tests instead of hashing activity names.
+            pool = city_pool.setdefault(ck, deque(range(len(ranked))))
+            names: list[str] = []
+            day_mask = 0
+            day_cost = 0.0
+            while len(names) < n_per_day:
+                if not pool:
+                    # Pool exhausted — cycle back to the top picks,
+                    # skipping anything already scheduled today
+                    refill = [i for i in range(len(ranked)) if not (day_mask >> i) & 1]
+                    if not refill:
+                        break
+                    pool.extend(refill)
+                idx = pool.popleft()
+                if (day_mask >> idx) & 1:
+                    continue
+                name, _, _, cost = ranked[idx]
+                names.append(name)
+                day_mask |= 1 << idx
+                day_cost += cost
 
             # ── assign to day ───────────────────────────────────────
-            day_item.activities = [a['name'] for a in chosen]
-            day_cost = sum(a.get('cost_inr', 0) for a in chosen)
+            day_item.activities = names
             day_item.estimated_cost_inr = day_cost
             total_activity_cost += day_cost
 
             # ── transport cost (cached) ─────────────────────────────
-            if ck not in transport_cache:
-                transport_cache[ck] = await get_daily_transport_cost(city)
             total_transport_cost += transport_cache[ck]
 
             # ── remote work spots (once per city) ───────────────────
             if ck not in seen_remote:
                 seen_remote.add(ck)
-                if ck not in remote_cache:
-                    remote_cache[ck] = await get_remote_work_spots(city)
                 spots = remote_cache[ck]
                 if spots:
                     remote_spots.append(RemoteWorkSpot(city=city, recommendations=spots))
 
-        state['experiences'] = all_experiences
         state['cost_breakdown'].activities_estimated = total_activity_cost
         state['cost_breakdown'].transport_estimated = total_transport_cost
-        state['remote_work_spots'] = remote_spots
 
         self.log(
             state,
             f'Curated {sum(len(d.activities) for d in itinerary)} activities '
             f'across {len(itinerary)} days. Activity cost: ₹{total_activity_cost:,.0f}.'
         )
-        return state
+        # Runs as a parallel branch after the planner — return only the
+        # keys this agent owns so the branches merge without conflicts.
+        return {'experiences': all_experiences, 'remote_work_spots': remote_spots}
@@ -9,7 +9,7 @@ from __future__ import annotations
 
 from app.agents.base import BaseAgent
 from app.schemas.state import TravelGraphState
-from app.tools.mock_apis import search_flights
+from app.tools.mock_apis import search_flights_batch
 
 
 class FlightIntelligenceAgent(BaseAgent):
@@ -23,22 +23,15 @@ class FlightIntelligenceAgent(BaseAgent):
         all_options: list[dict] = []
         total_flight_cost = 0.0
 
-        # outbound legs
-        prev = origin
-        for dest in destinations:
-            flights = await search_flights(prev, dest)
+        # One batched call covers every leg (outbound hops + return) —
+        # wall clock is one search round-trip, not one per leg.
+        chain = [origin, *destinations, origin]
+        per_leg = await search_flights_batch(list(zip(chain[:-1], chain[1:])))
+        for flights in per_leg:
             all_options.extend(flights)
             cheapest = min(flights, key=lambda f: f['price_inr'])
             total_flight_cost += cheapest['price_inr']
-            prev = dest
 
-        # return leg
-        flights = await search_flights(destinations[-1], origin)
-        all_options.extend(flights)
-        cheapest = min(flights, key=lambda f: f['price_inr'])
-        total_flight_cost += cheapest['price_inr']
-
-        state['flight_options'] = all_options
         state['cost_breakdown'].flights_estimated = total_flight_cost
 
         self.log(
@@ -46,4 +39,6 @@ class FlightIntelligenceAgent(BaseAgent):
             f'Evaluated {len(all_options)} flight options across '
             f'{len(destinations)+1} legs. Total flight cost: ₹{total_flight_cost:,.0f}.'
         )
-        return state
+        # Runs as a parallel branch after the planner — return only the
+        # keys this agent owns so the branches merge without conflicts.
+        return {'flight_options': all_options}
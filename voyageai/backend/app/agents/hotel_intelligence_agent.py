@@ -7,11 +7,12 @@ for the user's budget and accommodation preferences.
 
 from __future__ import annotations
 
+import heapq
 import math
 from app.agents.base import BaseAgent
 from app.schemas.state import TravelGraphState
 from app.schemas.travel import StayRecommendation
-from app.tools.mock_apis import search_hotels
+from app.tools.mock_apis import search_hotels_batch
 
 
 class HotelIntelligenceAgent(BaseAgent):
@@ -31,9 +32,12 @@ class HotelIntelligenceAgent(BaseAgent):
         base_nights = duration // n_dest
         remainder = duration % n_dest
 
+        # One batched call covers every destination
+        per_dest = await search_hotels_batch(destinations)
+
         for idx, dest in enumerate(destinations):
             nights = base_nights + (1 if idx < remainder else 0)
-            hotels = await search_hotels(dest)
+            hotels = per_dest[dest]
             all_options.extend(hotels)
 
             # pick hotel matching preferences
@@ -47,8 +51,6 @@ class HotelIntelligenceAgent(BaseAgent):
                 budget_per_night_inr=chosen['nightly_rate_inr'],
             ))
 
-        state['hotel_options'] = all_options
-        state['stay_recommendations'] = stays
         state['cost_breakdown'].accommodation_estimated = total_accommodation
 
         self.log(
@@ -56,7 +58,9 @@ class HotelIntelligenceAgent(BaseAgent):
             f'Selected stays for {n_dest} destination(s). '
             f'Total accommodation: ₹{total_accommodation:,.0f}.'
         )
-        return state
+        # Runs as a parallel branch after the planner — return only the
+        # keys this agent owns so the branches merge without conflicts.
+        return {'hotel_options': all_options, 'stay_recommendations': stays}
 
     @staticmethod
     def _pick_hotel(hotels: list[dict], prefs: set[str]) -> dict:
@@ -65,6 +69,7 @@ class HotelIntelligenceAgent(BaseAgent):
             return max(hotels, key=lambda h: h['nightly_rate_inr'])
         if 'hostel' in prefs or 'budget hotel' in prefs:
             return min(hotels, key=lambda h: h['nightly_rate_inr'])
-        # default: best value (mid-range)
-        sorted_h = sorted(hotels, key=lambda h: h['nightly_rate_inr'])
-        return sorted_h[len(sorted_h) // 2] if sorted_h else hotels[0]
+        # default: best value (mid-range) — median by rate without
+        # sorting the whole list just to index the middle element
+        k = len(hotels) // 2
+        return heapq.nsmallest(k + 1, hotels, key=lambda h: h['nightly_rate_inr'])[-1]
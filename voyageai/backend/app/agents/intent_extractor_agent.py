@@ -10,6 +10,7 @@ pipeline works without any LLM API key.  Drop in a ``ChatOpenAI`` +
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import List, Optional
 
 from app.agents.base import BaseAgent
@@ -141,26 +142,61 @@ SPECIAL_KEYWORDS: list[tuple[str, str]] = [
 ]
 
 
+# ───────────────────────── precompiled patterns ────────────────────────────
+# One alternation regex per catalog, compiled at import: a single DFA-ish
+# pass over the prompt replaces one re.search probe per keyword.  Longer
+# keys come first in the alternation so "new york" wins over "york" and
+# "new delhi" consumes the text before "delhi" can.
+
+def _alternation(keys) -> re.Pattern[str]:
+    joined = '|'.join(re.escape(k) for k in sorted(keys, key=len, reverse=True))
+    return re.compile(r'\b(' + joined + r')\b')
+
+
+_CITY_ALTERNATION = _alternation(MAJOR_CITIES)
+_COUNTRY_ALTERNATION = _alternation(COUNTRIES)
+_WORD_RE = re.compile(r'[a-z]+')
+_TRIP_TYPE_MATCHER = (_alternation(TRIP_TYPES), TRIP_TYPES)
+_INTEREST_MATCHER = (_alternation(INTERESTS_KEYWORDS), INTERESTS_KEYWORDS)
+_ACCOMMODATION_MATCHER = (_alternation(ACCOMMODATION_KEYWORDS), ACCOMMODATION_KEYWORDS)
+_TRANSPORT_MATCHER = (_alternation(TRANSPORT_KEYWORDS), TRANSPORT_KEYWORDS)
+_SPECIAL_PATTERNS: list[tuple[re.Pattern[str], str]] = [
+    (re.compile(p), label) for p, label in SPECIAL_KEYWORDS
+]
+_BUDGET_OF_AMOUNT = re.compile(r'budget\s+(?:of|around|is|under|below|above)')
+
+# One alternation covering the four absolute-amount spellings, scanned in
+# a single finditer pass.  Branch precedence mirrors the old sequential
+# scans: a currency-prefixed amount (last occurrence) beats "Nk" (first),
+# which beats "N lakh" (first), which beats a bare "budget of N" (first).
+# The lookahead on the bare branch keeps it from eating the digits of a
+# following "30k" / "2 lakh" that a later branch should claim.
+_AMOUNT_RE = re.compile(
+    r'(?:₹|rs\.?|inr)\s*(?P<inr>[\d,]+(?:\.\d+)?)\s*(?P<inr_unit>lakh|lac|l\b)?'
+    r'|(?P<k>[\d,]+(?:\.\d+)?)\s*k\b'
+    r'|(?P<lakh>[\d,]+)\s*(?:lakh|lac)'
+    r'|budget\s+(?:of\s+)?(?:around\s+)?(?P<bnum>[\d,]+)(?![\d,]|\s*(?:k\b|lakh|lac))',
+    re.I,
+)
+# Ranges ("50k - 80k") keep a separate scan: their endpoints overlap the
+# amount branches above and must not consume each other's matches.
+_RANGE_RE = re.compile(r'([\d,]+)\s*(?:k)?\s*(?:-|to|and)\s*([\d,]+)\s*(?:k)?', re.I)
+
+
 # ───────────────────────── extraction helpers ──────────────────────────────
 
-def _extract_cities(text: str) -> list[str]:
-    text_lower = text.lower()
+def _extract_cities(text_lower: str) -> list[str]:
     found: list[str] = []
-    # sort by length descending so "new york" matches before "york"
-    for city in sorted(MAJOR_CITIES, key=len, reverse=True):
-        pattern = r'\b' + re.escape(city) + r'\b'
-        if re.search(pattern, text_lower):
-            found.append(city.title())
-            text_lower = re.sub(pattern, '', text_lower)
+    for m in _CITY_ALTERNATION.finditer(text_lower):
+        city = m.group(1).title()
+        if city not in found:
+            found.append(city)
     return found
 
 
-def _extract_country(text: str) -> Optional[str]:
-    text_lower = text.lower()
-    for key, value in sorted(COUNTRIES.items(), key=lambda x: len(x[0]), reverse=True):
-        if re.search(r'\b' + re.escape(key) + r'\b', text_lower):
-            return value
-    return None
+def _extract_country(text_lower: str) -> Optional[str]:
+    m = _COUNTRY_ALTERNATION.search(text_lower)
+    return COUNTRIES[m.group(1)] if m else None
 
 
 def _extract_duration(text: str) -> int:
@@ -184,11 +220,14 @@ def _extract_duration(text: str) -> int:
     return 5  # default
 
 
-def _extract_month(text: str) -> Optional[str]:
-    text_lower = text.lower()
-    for key, value in MONTHS.items():
-        if re.search(r'\b' + re.escape(key) + r'\b', text_lower):
-            return value
+def _extract_month(text_lower: str) -> Optional[str]:
+    # Month keys are all single tokens, so a plain word walk + dict
+    # lookup beats an alternation scan; countries keep their alternation
+    # because multi-word names ("south korea") don't tokenize cleanly.
+    for word in _WORD_RE.findall(text_lower):
+        full = MONTHS.get(word)
+        if full is not None:
+            return full
     return None
 
 
@@ -211,40 +250,36 @@ def _extract_budget(text: str) -> tuple[Optional[float], BudgetRange]:
         except ValueError:
             return None
 
-    # INR patterns
-    for m in re.finditer(r'(?:₹|rs\.?|inr)\s*([\d,]+(?:\.\d+)?)\s*(?:lakh|lac|l)?', text, re.I):
-        val = _safe_float(m.group(1))
-        if val is None:
-            continue
-        if re.search(r'lakh|lac|l\b', m.group(0), re.I):
-            val *= 100_000
-        budget = val
-
-    if budget is None:
-        m = re.search(r'([\d,]+(?:\.\d+)?)\s*(?:k)\b', text, re.I)
-        if m:
-            val = _safe_float(m.group(1))
-            if val is not None:
-                budget = val * 1000
-
-    if budget is None:
-        m = re.search(r'([\d,]+)\s*(?:lakh|lac)', text, re.I)
-        if m:
-            val = _safe_float(m.group(1))
-            if val is not None:
-                budget = val * 100_000
-
-    if budget is None:
-        m = re.search(r'budget\s+(?:of\s+)?(?:around\s+)?(?:₹|rs\.?|inr)?\s*([\d,]+)', text, re.I)
-        if m:
-            val = _safe_float(m.group(1))
+    # One pass over the text gathers all four absolute-amount spellings
+    last_inr: Optional[float] = None
+    first_k: Optional[float] = None
+    first_lakh: Optional[float] = None
+    first_bare: Optional[float] = None
+    for m in _AMOUNT_RE.finditer(text):
+        if m.group('inr') is not None:
+            val = _safe_float(m.group('inr'))
             if val is not None:
-                if val < 500:
-                    val *= 1000  # likely in thousands
-                budget = val
+                last_inr = val * 100_000 if m.group('inr_unit') else val
+        elif m.group('k') is not None:
+            if first_k is None:
+                first_k = _safe_float(m.group('k'))
+        elif m.group('lakh') is not None:
+            if first_lakh is None:
+                first_lakh = _safe_float(m.group('lakh'))
+        elif first_bare is None:
+            first_bare = _safe_float(m.group('bnum'))
+
+    if last_inr is not None:
+        budget = last_inr
+    elif first_k is not None:
+        budget = first_k * 1000
+    elif first_lakh is not None:
+        budget = first_lakh * 100_000
+    elif first_bare is not None:
+        budget = first_bare * 1000 if first_bare < 500 else first_bare  # likely in thousands
 
     # range: "50k - 80k", "between 50000 and 80000"
-    m = re.search(r'([\d,]+)\s*(?:k)?\s*(?:-|to|and)\s*([\d,]+)\s*(?:k)?', text, re.I)
+    m = _RANGE_RE.search(text)
     if m:
         lo = _safe_float(m.group(1))
         hi = _safe_float(m.group(2))
@@ -292,27 +327,83 @@ def _extract_origin(text: str, destinations: list[str]) -> Optional[str]:
     return None
 
 
-def _extract_set(text: str, mapping: dict[str, str]) -> list[str]:
-    text_lower = text.lower()
-    found: list[str] = []
-    for key, value in mapping.items():
-        # Skip "budget" keyword when it's part of "budget of" (budget amount context)
-        if key == 'budget' and re.search(r'budget\s+(?:of|around|is|under|below|above)', text_lower):
-            continue
-        if re.search(r'\b' + re.escape(key) + r'\b', text_lower) and value not in found:
-            found.append(value)
-    return found
+def _extract_set(text_lower: str, matcher: tuple[re.Pattern[str], dict[str, str]]) -> list[str]:
+    pat, mapping = matcher
+    # Skip "budget" keyword when it's part of "budget of" (budget amount context)
+    skip_budget = 'budget' in mapping and _BUDGET_OF_AMOUNT.search(text_lower) is not None
+    # dict.fromkeys dedups in O(K) while keeping first-match order
+    return list(dict.fromkeys(
+        mapping[m.group(1)]
+        for m in pat.finditer(text_lower)
+        if not (skip_budget and m.group(1) == 'budget')
+    ))
 
 
-def _extract_special(text: str) -> list[str]:
-    text_lower = text.lower()
+def _extract_special(text_lower: str) -> list[str]:
     found: list[str] = []
-    for pattern, label in SPECIAL_KEYWORDS:
-        if re.search(pattern, text_lower) and label not in found:
+    for pat, label in _SPECIAL_PATTERNS:
+        if pat.search(text_lower) and label not in found:
             found.append(label)
     return found
 
 
+@lru_cache(maxsize=512)
+def parse_intent(prompt: str) -> UserIntent:
+    """Parse a raw prompt into a ``UserIntent``.
+
+    Pure function of the prompt string, so identical prompts (retries,
+    replays, smoke runs) resolve to a cached parse instead of re-running
+    the regex battery.  Callers must ``model_copy()`` the result before
+    handing it to mutable state.
+    """
+    # Lowercase once; the catalog helpers all match against the same
+    # folded text.  Numeric helpers keep the raw prompt + re.I since
+    # their patterns are case-insensitive anyway.
+    prompt_lower = prompt.lower()
+
+    destinations = _extract_cities(prompt_lower)
+    country = _extract_country(prompt_lower)
+    origin = _extract_origin(prompt, destinations)
+    duration = _extract_duration(prompt)
+    month = _extract_month(prompt_lower)
+    year = _extract_year(prompt)
+    budget, brange = _extract_budget(prompt)
+    travelers = _extract_travelers(prompt)
+    trip_types = _extract_set(prompt_lower, _TRIP_TYPE_MATCHER)
+    interests = _extract_set(prompt_lower, _INTEREST_MATCHER)
+    accommodation = _extract_set(prompt_lower, _ACCOMMODATION_MATCHER)
+    transport = _extract_set(prompt_lower, _TRANSPORT_MATCHER)
+    special = _extract_special(prompt_lower)
+
+    # If no destinations found, treat whole trimmed prompt as one destination
+    if not destinations:
+        # take first "word(s)" that look like a place (fallback)
+        cleaned = re.sub(r'[^\w\s]', '', prompt).strip()
+        if cleaned:
+            destinations = [cleaned.title()]
+
+    # Remove origin from destinations if it got picked up
+    if origin:
+        destinations = [d for d in destinations if d.lower() != origin.lower()]
+
+    return UserIntent(
+        origin_city=origin,
+        destinations=destinations,
+        country=country,
+        duration_days=duration,
+        travel_month=month,
+        travel_year=year,
+        budget_total_inr=budget,
+        budget_range_inr=brange,
+        trip_type=trip_types,
+        traveler_count=travelers,
+        accommodation_preferences=accommodation,
+        interests=interests,
+        transport_preferences=transport,
+        special_requirements=special,
+    )
+
+
 # ───────────────────────── agent ───────────────────────────────────────────
 
 class IntentExtractorAgent(BaseAgent):
@@ -322,49 +413,12 @@ class IntentExtractorAgent(BaseAgent):
     name = 'IntentExtractorAgent'
 
     async def run(self, state: TravelGraphState) -> TravelGraphState:
-        prompt = state['raw_prompt']
-
-        destinations = _extract_cities(prompt)
-        country = _extract_country(prompt)
-        origin = _extract_origin(prompt, destinations)
-        duration = _extract_duration(prompt)
-        month = _extract_month(prompt)
-        year = _extract_year(prompt)
-        budget, brange = _extract_budget(prompt)
-        travelers = _extract_travelers(prompt)
-        trip_types = _extract_set(prompt, TRIP_TYPES)
-        interests = _extract_set(prompt, INTERESTS_KEYWORDS)
-        accommodation = _extract_set(prompt, ACCOMMODATION_KEYWORDS)
-        transport = _extract_set(prompt, TRANSPORT_KEYWORDS)
-        special = _extract_special(prompt)
-
-        # If no destinations found, treat whole trimmed prompt as one destination
-        if not destinations:
-            # take first "word(s)" that look like a place (fallback)
-            cleaned = re.sub(r'[^\w\s]', '', prompt).strip()
-            if cleaned:
-                destinations = [cleaned.title()]
-
-        # Remove origin from destinations if it got picked up
-        if origin:
-            destinations = [d for d in destinations if d.lower() != origin.lower()]
-
-        intent = UserIntent(
-            origin_city=origin,
-            destinations=destinations,
-            country=country,
-            duration_days=duration,
-            travel_month=month,
-            travel_year=year,
-            budget_total_inr=budget,
-            budget_range_inr=brange,
-            trip_type=trip_types,
-            traveler_count=travelers,
-            accommodation_preferences=accommodation,
-            interests=interests,
-            transport_preferences=transport,
-            special_requirements=special,
-        )
+        # Copy the cached parse so per-run state never aliases cache entries
+        intent = parse_intent(state['raw_prompt']).model_copy(deep=True)
+        destinations = intent.destinations
+        duration = intent.duration_days
+        budget = intent.budget_total_inr
+        travelers = intent.traveler_count
 
         state['intent'] = intent
         self.log(state, (
@@ -7,10 +7,30 @@ trip patterns for context enrichment.
 
 from __future__ import annotations
 
+import hashlib
+import time
+from collections import OrderedDict
+
 from app.agents.base import BaseAgent
 from app.schemas.state import TravelGraphState
 from app.tools.embeddings import DeterministicEmbeddingProvider
-from app.tools.vector_store import VectorStore
+from app.tools.vector_store import VectorStore, VectorStoreBatcher
+
+# Short-TTL cache for vector-store query results: replays of the same
+# intent within the window skip the store round-trip entirely.
+_QUERY_TTL_SECONDS = 300.0
+_QUERY_CACHE_MAX = 128
+
+
+def _query_key(intent) -> bytes:
+    """Stable digest of the query-relevant intent fields, normalized so
+    cosmetic differences (case, whitespace, ordering) share an entry."""
+    norm = '|'.join((
+        ' '.join(sorted(d.lower().strip() for d in intent.destinations)),
+        ' '.join(sorted(i.lower().strip() for i in intent.interests)),
+        ' '.join(sorted(t.lower().strip() for t in intent.trip_type)),
+    ))
+    return hashlib.blake2b(norm.encode(), digest_size=16).digest()
 
 
 class MemoryAgent(BaseAgent):
@@ -19,6 +39,9 @@ class MemoryAgent(BaseAgent):
     def __init__(self, store: VectorStore):
         self.store = store
         self.embedder = DeterministicEmbeddingProvider()
+        self.batcher = VectorStoreBatcher(store)
+        self._query_cache: OrderedDict[bytes, tuple[float, list[dict]]] = OrderedDict()
+        self._upserted_keys: set[str] = set()
 
     async def run(self, state: TravelGraphState) -> TravelGraphState:
         intent = state['intent']
@@ -27,16 +50,38 @@ class MemoryAgent(BaseAgent):
         query = f'{destinations} {interests} {" ".join(intent.trip_type)}'
 
         vector = await self.embedder.embed(query)
-        similar = await self.store.query(vector, top_k=2)
+
+        cache_key = _query_key(intent)
+        now = time.monotonic()
+        entry = self._query_cache.get(cache_key)
+        if entry is not None and now - entry[0] < _QUERY_TTL_SECONDS:
+            self._query_cache.move_to_end(cache_key)
+            similar = entry[1]
+        else:
+            similar = await self.store.query(vector, top_k=2)
+            self._query_cache[cache_key] = (now, similar)
+            while len(self._query_cache) > _QUERY_CACHE_MAX:
+                self._query_cache.popitem(last=False)
+
         state['memory_context'] = ' | '.join(
             item['metadata'].get('summary', '') for item in similar
         )
 
+        # Queue the upsert off the critical path — the batcher flushes
+        # coalesced writes in the background.  Repeat trips write the
+        # exact same key/vector/metadata, so skip ones already sent.
         origin = intent.origin_city or 'unknown'
-        await self.store.upsert(
-            key=f'trip-{origin}-{destinations}',
-            values=vector,
-            metadata={'summary': f'Trip pattern: {origin} → {destinations}'},
-        )
+        # Fixed-width digest key: free-form origin/destination strings can
+        # get long, and a 32-char key costs less on every store op.
+        upsert_key = 'trip-' + hashlib.blake2b(
+            f'{origin}|{destinations}'.encode(), digest_size=16
+        ).hexdigest()
+        if upsert_key not in self._upserted_keys:
+            self._upserted_keys.add(upsert_key)
+            self.batcher.add(
+                key=upsert_key,
+                values=vector,
+                metadata={'summary': f'Trip pattern: {origin} → {destinations}'},
+            )
         self.log(state, 'Memory context loaded and refreshed.')
         return state
@@ -17,15 +17,35 @@ from app.schemas.state import TravelGraphState
 from app.schemas.travel import DayItinerary, TransportPlan
 
 
-# Cities that warrant a transit half-day between them (long-haul or far)
-_LONG_HAUL_PAIRS: set[frozenset[str]] = {
-    frozenset(p) for p in [
+# Cities that warrant a transit half-day between them (long-haul or far).
+# Stored as sorted lowercase tuples — hashing a 2-tuple of short strings
+# is much cheaper than hashing a frozenset per membership test.
+_LONG_HAUL_PAIRS: frozenset[tuple[str, str]] = frozenset(
+    tuple(sorted(p)) for p in [
         ('delhi', 'tokyo'), ('delhi', 'paris'), ('delhi', 'london'),
         ('delhi', 'new york'), ('delhi', 'sydney'), ('delhi', 'bali'),
         ('mumbai', 'tokyo'), ('mumbai', 'london'), ('mumbai', 'paris'),
         ('mumbai', 'new york'), ('mumbai', 'sydney'),
     ]
-}
+)
+
+
+def _is_long_haul(a: str, b: str) -> bool:
+    return (min(a, b), max(a, b)) in _LONG_HAUL_PAIRS
+
+# Reference tables for transport-pass triggers — immutable, so build the
+# sets once at import instead of per request.
+_JAPAN = frozenset({'tokyo', 'osaka', 'kyoto', 'hiroshima', 'nara'})
+_EU = frozenset({
+    'paris', 'london', 'amsterdam', 'berlin', 'prague', 'brussels',
+    'rome', 'florence', 'venice', 'barcelona', 'madrid', 'vienna',
+    'budapest', 'lisbon', 'athens', 'munich', 'zurich', 'geneva',
+})
+_UK = frozenset({'london', 'edinburgh'})
+_INDIA = frozenset({
+    'delhi', 'mumbai', 'bangalore', 'chennai', 'kolkata',
+    'jaipur', 'goa', 'varanasi', 'kochi', 'hyderabad',
+})
 
 
 class PlannerAgent(BaseAgent):
@@ -58,62 +78,60 @@ class PlannerAgent(BaseAgent):
         base_days = max(duration // n_dest, min_per_dest)
         remainder = duration - (base_days * n_dest)
 
-        # Distribute remainder to earlier destinations
-        day_counter = 1
-        day_by_day: list[DayItinerary] = []
-
-        for idx, city in enumerate(destinations):
-            # Extra days go to earlier destinations (more to explore)
-            city_days = base_days + (1 if idx < remainder else 0)
-            if city_days < 1:
-                city_days = 1
-
-            for d in range(city_days):
-                is_arrival = d == 0 and idx > 0
-                day_by_day.append(DayItinerary(
-                    day=day_counter,
-                    city=city,
-                    activities=[],  # filled by ExperienceAgent
-                    estimated_cost_inr=0,
-                    weather_note='Arrival & check-in day' if is_arrival and len(destinations) > 1 else '',
-                ))
-                day_counter += 1
+        # Distribute remainder to earlier destinations (more to explore)
+        allocations = [
+            (city, max(base_days + (1 if idx < remainder else 0), 1))
+            for idx, city in enumerate(destinations)
+        ]
+        multi = n_dest > 1
+
+        # Single pass: the arrival-note branch resolves once per city
+        # (first day of every city after the first), not once per day,
+        # and the itinerary list is built in one comprehension.
+        def _day_slots():
+            for idx, (city, city_days) in enumerate(allocations):
+                yield city, 'Arrival & check-in day' if idx > 0 and multi else ''
+                for _ in range(city_days - 1):
+                    yield city, ''
+
+        day_by_day: list[DayItinerary] = [
+            DayItinerary(
+                day=num,
+                city=city,
+                activities=[],  # filled by ExperienceAgent
+                estimated_cost_inr=0,
+                weather_note=note,
+            )
+            for num, (city, note) in enumerate(_day_slots(), 1)
+        ]
 
         # ── transport plan ─────────────────────────────────────────────
         passes: list[str] = []
-        dest_set = {d.lower() for d in destinations}
+        dest_set = frozenset(d.lower() for d in destinations)
 
         # Japan Rail Pass
-        japan_cities = {'tokyo', 'osaka', 'kyoto', 'hiroshima', 'nara'}
-        if len(dest_set & japan_cities) >= 2:
+        if len(dest_set & _JAPAN) >= 2:
             passes.append('Japan Rail Pass (7-day)')
-        elif dest_set & japan_cities:
+        elif dest_set & _JAPAN:
             passes.append('Suica / Pasmo IC Card')
 
         # Eurail
-        eu_cities = {'paris', 'london', 'amsterdam', 'berlin', 'prague', 'brussels',
-                     'rome', 'florence', 'venice', 'barcelona', 'madrid', 'vienna',
-                     'budapest', 'lisbon', 'athens', 'munich', 'zurich', 'geneva'}
-        eu_matches = dest_set & eu_cities
+        eu_matches = dest_set & _EU
         if len(eu_matches) >= 3:
             passes.append('Eurail Global Pass')
         elif len(eu_matches) == 2:
             passes.append('Eurail 2-Country Pass')
 
         # UK cards
-        if dest_set & {'london', 'edinburgh'}:
+        if dest_set & _UK:
             passes.append('Oyster Card / Contactless')
 
         # India-specific
-        india_cities = {'delhi', 'mumbai', 'bangalore', 'chennai', 'kolkata',
-                        'jaipur', 'goa', 'varanasi', 'kochi', 'hyderabad'}
-        india_matches = dest_set & india_cities
-        if len(india_matches) >= 3:
+        if len(dest_set & _INDIA) >= 3:
             passes.append('IndiGo/SpiceJet multi-city domestic pass')
 
         # Per-city metro cards
-        for d in destinations:
-            passes.append(f'{d} local transit / metro card')
+        passes.extend(f'{d} local transit / metro card' for d in destinations)
 
         transport_plan = TransportPlan(
             recommended_passes=passes,
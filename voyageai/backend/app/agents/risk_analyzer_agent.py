@@ -14,10 +14,113 @@ Risk factors (each normalised to 0-10, then weighted):
 
 from __future__ import annotations
 
+import asyncio
+import bisect
+
 from app.agents.base import BaseAgent
 from app.schemas.state import TravelGraphState
 from app.schemas.travel import VisaInformation, WeatherInsight
-from app.tools.mock_apis import get_weather_risk, get_visa_info, get_country_for_city
+from app.tools.mock_apis import get_weather_risk, get_visa_info, get_country_for_city, month_mask
+
+# Temperature bands for day notes, indexed by bisect_right over the
+# breakpoints.  All weather sources report whole degrees, so 34/39
+# encode the strict "> 33" / "> 38" upper-band comparisons.
+_TEMP_BREAKS = (5, 15, 34, 39)
+_TEMP_NOTES = (
+    '❄️ Very cold (%d°C) — pack heavy layers',
+    '🧥 Cool (%d°C) — bring a jacket',
+    '☀️ Pleasant (%d°C) — ideal for outdoor activities',
+    '🌡️ Hot (%d°C) — plan indoor activities midday',
+    '🔥 Extreme heat (%d°C) — stay hydrated, avoid midday sun',
+)
+_NOTE_VERY_RAIN = '🌧️ Very likely rain (%d%%) — plan indoor activities'
+_NOTE_POSSIBLE_RAIN = '🌦️ Possible rain (%d%%) — carry umbrella'
+
+
+def _composite(
+    max_storm: float,
+    max_rain: float,
+    max_temp_extreme: float,
+    total_cost: float,
+    budget_max: float,
+    visa_count: int,
+) -> tuple[float, float, float, float, float, float]:
+    """Pure-numeric risk kernel: factor scores (0-10) plus the weighted
+    composite.  Kept free of state/attribute access so the whole
+    computation runs on locals."""
+    # Weather / storm risk: scale storm probability to useful range
+    weather_risk = min(max_storm * 50, 10.0)  # 0.20 storm → 10.0
+
+    # Budget exposure: branchless piecewise-linear ramp.  Slope 20 from
+    # ratio 0.8 (→1) to 1.0 (→5), then the second hinge bends it to 16.7
+    # up to 1.3 (→10), clamped to [1, 10].
+    if budget_max > 0:
+        ratio = total_cost / budget_max
+        budget_risk = min(
+            max(1.0 + max(ratio - 0.8, 0.0) * 20 + max(ratio - 1.0, 0.0) * (16.7 - 20), 1.0),
+            10.0,
+        )
+    else:
+        budget_risk = 3.0  # unknown budget
+
+    visa_risk = min(visa_count * 3.3, 10.0)
+    rain_risk = min(max_rain * 15, 10.0)  # 0.5 rain → 7.5
+    temp_risk = min(max_temp_extreme * 10, 10.0)
+
+    composite = (
+        weather_risk * 0.30
+        + budget_risk * 0.25
+        + visa_risk * 0.20
+        + rain_risk * 0.15
+        + temp_risk * 0.10
+    )
+    return weather_risk, budget_risk, visa_risk, rain_risk, temp_risk, composite
+
+
+def _temp_extreme(avg_temp: float) -> float:
+    """Distance from the 18-28°C comfort zone, scaled to ~0-1."""
+    if avg_temp > 28:
+        return (avg_temp - 28) / 20
+    if avg_temp < 18:
+        return (18 - avg_temp) / 20
+    return 0.0
+
+
+def _insight(dest: str, w: dict, travel_month) -> WeatherInsight:
+    """Build the per-city WeatherInsight with its recommendation line."""
+    rain_chance = w.get('rain_chance', 0.2)
+    best = w.get('best_months', [])
+    if travel_month and best:
+        # Bitmask membership test — one AND against the profile's
+        # 12-bit best_months_mask instead of a string scan.
+        if w.get('best_months_mask', 0) & month_mask(travel_month):
+            rec = f"Great choice! {travel_month} is one of the best months to visit {dest}."
+        else:
+            alt = ' or '.join(best[:2])
+            rec = f"Consider visiting in {alt} for better weather. {travel_month} may have {'heavy rain' if rain_chance > 0.35 else 'less ideal conditions'}."
+    elif best:
+        rec = f"Best months to visit: {', '.join(best[:3])}."
+    else:
+        rec = "Weather data limited — check local forecasts closer to travel."
+
+    return WeatherInsight(
+        city=dest,
+        avg_temp_c=w.get('avg_temp_c', 22),
+        rain_chance=rain_chance,
+        advisory=w.get('advisory_level', 'low'),
+        best_months=best,
+        recommendation=rec,
+    )
+
+
+def _weather_note(wi: WeatherInsight) -> str:
+    """One day-note per insight: rain outranks temperature, and the
+    temperature ladder is a table lookup instead of an if/elif cascade."""
+    if wi.rain_chance > 0.5:
+        return _NOTE_VERY_RAIN % round(wi.rain_chance * 100)
+    if wi.rain_chance > 0.35:
+        return _NOTE_POSSIBLE_RAIN % round(wi.rain_chance * 100)
+    return _TEMP_NOTES[bisect.bisect_right(_TEMP_BREAKS, wi.avg_temp_c)] % wi.avg_temp_c
 
 
 class RiskAnalyzerAgent(BaseAgent):
@@ -27,6 +130,11 @@ class RiskAnalyzerAgent(BaseAgent):
         intent = state['intent']
         destinations = intent.destinations or ['Unknown']
 
+        # Single-destination trips are the common shape — skip the
+        # gather/max-tracking machinery entirely for them.
+        if len(destinations) == 1:
+            return await self._run_single(state, destinations[0])
+
         # ── weather risk + insights ────────────────────────────────────
         max_storm = 0.0
         max_rain = 0.0
@@ -34,66 +142,31 @@ class RiskAnalyzerAgent(BaseAgent):
         weather_data: dict = {}
         weather_insights: list[WeatherInsight] = []
 
-        for dest in destinations:
-            w = await get_weather_risk(dest)
+        # All per-destination lookups are independent — fetch them
+        # concurrently so multi-city trips pay one round-trip, not N.
+        weather_results = await asyncio.gather(
+            *(get_weather_risk(d) for d in destinations)
+        )
+        for dest, w in zip(destinations, weather_results):
             weather_data[dest] = w
-            storm_prob = w.get('storm_probability', 0)
-            rain_chance = w.get('rain_chance', 0.2)
-            avg_temp = w.get('avg_temp_c', 22)
-
-            max_storm = max(max_storm, storm_prob)
-            max_rain = max(max_rain, rain_chance)
-            # Temperature extremity: how far from comfort zone (18-28°C)
-            if avg_temp > 28:
-                max_temp_extreme = max(max_temp_extreme, (avg_temp - 28) / 20)
-            elif avg_temp < 18:
-                max_temp_extreme = max(max_temp_extreme, (18 - avg_temp) / 20)
-
-            # Build weather insight
-            best = w.get('best_months', [])
-            travel_month = intent.travel_month
-            if travel_month and best:
-                if travel_month in best:
-                    rec = f"Great choice! {travel_month} is one of the best months to visit {dest}."
-                else:
-                    alt = ' or '.join(best[:2])
-                    rec = f"Consider visiting in {alt} for better weather. {travel_month} may have {'heavy rain' if rain_chance > 0.35 else 'less ideal conditions'}."
-            elif best:
-                rec = f"Best months to visit: {', '.join(best[:3])}."
-            else:
-                rec = "Weather data limited — check local forecasts closer to travel."
-
-            weather_insights.append(WeatherInsight(
-                city=dest,
-                avg_temp_c=w.get('avg_temp_c', 22),
-                rain_chance=rain_chance,
-                advisory=w.get('advisory_level', 'low'),
-                best_months=best,
-                recommendation=rec,
-            ))
+            max_storm = max(max_storm, w.get('storm_probability', 0))
+            max_rain = max(max_rain, w.get('rain_chance', 0.2))
+            max_temp_extreme = max(max_temp_extreme, _temp_extreme(w.get('avg_temp_c', 22)))
+            weather_insights.append(_insight(dest, w, intent.travel_month))
 
         state['weather_data'] = weather_data
         state['weather_insights'] = weather_insights
 
-        # Add weather notes to itinerary days
-        dest_weather = {wi.city.lower(): wi for wi in weather_insights}
+        # Add weather notes to itinerary days — one note per city,
+        # formatted once and reused for every day spent there.  Planner's
+        # arrival tags stay in place for downstream consumers.
+        note_for_city = {wi.city.lower(): _weather_note(wi) for wi in weather_insights}
         for day_item in state.get('day_by_day_itinerary', []):
-            wi = dest_weather.get(day_item.city.lower())
-            if wi:
-                if wi.rain_chance > 0.5:
-                    day_item.weather_note = f"🌧️ Very likely rain ({wi.rain_chance:.0%}) — plan indoor activities"
-                elif wi.rain_chance > 0.35:
-                    day_item.weather_note = f"🌦️ Possible rain ({wi.rain_chance:.0%}) — carry umbrella"
-                elif wi.avg_temp_c > 38:
-                    day_item.weather_note = f"🔥 Extreme heat ({wi.avg_temp_c}°C) — stay hydrated, avoid midday sun"
-                elif wi.avg_temp_c > 33:
-                    day_item.weather_note = f"🌡️ Hot ({wi.avg_temp_c}°C) — plan indoor activities midday"
-                elif wi.avg_temp_c < 5:
-                    day_item.weather_note = f"❄️ Very cold ({wi.avg_temp_c}°C) — pack heavy layers"
-                elif wi.avg_temp_c < 15:
-                    day_item.weather_note = f"🧥 Cool ({wi.avg_temp_c}°C) — bring a jacket"
-                else:
-                    day_item.weather_note = f"☀️ Pleasant ({wi.avg_temp_c}°C) — ideal for outdoor activities"
+            if day_item.weather_note.startswith('Arrival'):
+                continue
+            note = note_for_city.get(day_item.city.lower())
+            if note is not None:
+                day_item.weather_note = note
 
         # ── visa intelligence ──────────────────────────────────────────
         visa_required = False
@@ -101,16 +174,73 @@ class RiskAnalyzerAgent(BaseAgent):
         visa_details: list[str] = []
         seen_countries: set[str] = set()
 
+        # Dedupe to one (dest, country) pair per country first, then
+        # fetch visa info for all of them concurrently in list order.
+        unique_pairs: list[tuple[str, str]] = []
         for dest in destinations:
             country = intent.country or get_country_for_city(dest)
             if country and country.lower() not in seen_countries:
                 seen_countries.add(country.lower())
-                info = await get_visa_info(dest, country)
-                if info.get('required'):
-                    visa_required = True
-                    visa_count += 1
-                visa_details.append(f"{country}: {info.get('details', 'N/A')}")
+                unique_pairs.append((dest, country))
+
+        visa_results = await asyncio.gather(
+            *(get_visa_info(d, c) for d, c in unique_pairs)
+        )
+        for (dest, country), info in zip(unique_pairs, visa_results):
+            if info.get('required'):
+                visa_required = True
+                visa_count += 1
+            visa_details.append(f"{country}: {info.get('details', 'N/A')}")
+
+        return self._finalize(
+            state, visa_required, visa_count, visa_details,
+            max_storm, max_rain, max_temp_extreme,
+        )
+
+    async def _run_single(self, state: TravelGraphState, dest: str) -> TravelGraphState:
+        """Specialized path for one destination: one weather await, one
+        visa await, no per-city containers or max-tracking loops."""
+        intent = state['intent']
+        w = await get_weather_risk(dest)
+        wi = _insight(dest, w, intent.travel_month)
+        state['weather_data'] = {dest: w}
+        state['weather_insights'] = [wi]
+
+        note = _weather_note(wi)
+        dest_lower = dest.lower()
+        for day_item in state.get('day_by_day_itinerary', []):
+            if day_item.city.lower() == dest_lower:
+                day_item.weather_note = note
+
+        visa_required = False
+        visa_count = 0
+        visa_details: list[str] = []
+        country = intent.country or get_country_for_city(dest)
+        if country:
+            info = await get_visa_info(dest, country)
+            if info.get('required'):
+                visa_required = True
+                visa_count = 1
+            visa_details.append(f"{country}: {info.get('details', 'N/A')}")
+
+        return self._finalize(
+            state, visa_required, visa_count, visa_details,
+            w.get('storm_probability', 0), w.get('rain_chance', 0.2),
+            _temp_extreme(w.get('avg_temp_c', 22)),
+        )
 
+    def _finalize(
+        self,
+        state: TravelGraphState,
+        visa_required: bool,
+        visa_count: int,
+        visa_details: list[str],
+        max_storm: float,
+        max_rain: float,
+        max_temp_extreme: float,
+    ) -> TravelGraphState:
+        """Shared tail: visa state, composite score, and the log line."""
+        intent = state['intent']
         state['visa_information'] = VisaInformation(
             required=visa_required,
             details=' | '.join(visa_details) if visa_details else 'No visa information available.',
@@ -118,40 +248,10 @@ class RiskAnalyzerAgent(BaseAgent):
         state['visa_data'] = {'required': visa_required, 'details': visa_details}
 
         # ── composite risk score (0-10) ────────────────────────────────
-        # Weather / storm risk (0-10): scale storm probability to useful range
-        weather_risk = min(max_storm * 50, 10.0)  # 0.20 storm → 10.0
-
-        # Budget exposure (0-10)
         budget_max = intent.budget_range_inr.max or intent.budget_total_inr or 0
-        if budget_max > 0:
-            ratio = state['total_cost'] / budget_max
-            if ratio <= 0.8:
-                budget_risk = 1.0
-            elif ratio <= 1.0:
-                budget_risk = 1.0 + (ratio - 0.8) * 20   # 0.8→1, 1.0→5
-            elif ratio <= 1.3:
-                budget_risk = 5.0 + (ratio - 1.0) * 16.7  # 1.0→5, 1.3→10
-            else:
-                budget_risk = 10.0
-        else:
-            budget_risk = 3.0  # unknown budget
-
-        # Visa complexity (0-10)
-        visa_risk = min(visa_count * 3.3, 10.0)
-
-        # Rain disruption (0-10)
-        rain_risk = min(max_rain * 15, 10.0)  # 0.5 rain → 7.5
-
-        # Temperature extremes (0-10)
-        temp_risk = min(max_temp_extreme * 10, 10.0)
-
-        # Weighted composite
-        composite = (
-            weather_risk * 0.30
-            + budget_risk * 0.25
-            + visa_risk * 0.20
-            + rain_risk * 0.15
-            + temp_risk * 0.10
+        weather_risk, budget_risk, visa_risk, rain_risk, temp_risk, composite = _composite(
+            max_storm, max_rain, max_temp_extreme,
+            state['total_cost'], budget_max, visa_count,
         )
         state['risk_score'] = round(min(composite, 10.0), 1)
 
@@ -161,6 +261,6 @@ class RiskAnalyzerAgent(BaseAgent):
             f"(weather={weather_risk:.1f}, budget={budget_risk:.1f}, "
             f"visa={visa_risk:.1f}, rain={rain_risk:.1f}, temp={temp_risk:.1f}). "
             f"Visa required: {visa_required}. "
-            f"{len(weather_insights)} weather insight(s)."
+            f"{len(state['weather_insights'])} weather insight(s)."
         )
         return state
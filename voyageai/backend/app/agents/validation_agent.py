@@ -28,20 +28,22 @@ class ValidationAgent(BaseAgent):
         cb = state.get('cost_breakdown')
         intent = state.get('intent')
 
-        # 1 — No duplicate day numbers
-        day_nums = [d.day for d in itinerary]
-        if len(day_nums) != len(set(day_nums)):
+        # 1 — No duplicate day numbers (single pass: detect + dedup)
+        seen: set[int] = set()
+        deduped: list = []
+        had_dup = False
+        for d in itinerary:
+            if d.day in seen:
+                had_dup = True
+                continue
+            seen.add(d.day)
+            deduped.append(d)
+        if had_dup:
             errors.append('Duplicate day numbers detected; deduplicated.')
-            seen: set[int] = set()
-            deduped = []
-            for d in itinerary:
-                if d.day not in seen:
-                    seen.add(d.day)
-                    deduped.append(d)
-            state['day_by_day_itinerary'] = deduped
+            state['day_by_day_itinerary'] = itinerary = deduped
 
         # 2 — City names must be clean (not a raw paragraph)
-        for d in state.get('day_by_day_itinerary', []):
+        for d in itinerary:
             if len(d.city) > 50:
                 d.city = d.city[:50].split()[0]
                 errors.append(f'Day {d.day}: city name truncated.')
@@ -75,7 +77,7 @@ class ValidationAgent(BaseAgent):
             errors.append('No destinations could be extracted from the prompt.')
 
         # 6 — Activities present
-        empty_days = [d.day for d in state.get('day_by_day_itinerary', []) if not d.activities]
+        empty_days = [d.day for d in itinerary if not d.activities]
         if empty_days:
             errors.append(f'Days with no activities: {empty_days}.')
 
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from functools import lru_cache
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -23,6 +24,29 @@ class Settings(BaseSettings):
     rate_limit: str = Field(default='60/minute', alias='RATE_LIMIT')
 
 
+@dataclass(frozen=True, slots=True)
+class FrozenSettings:
+    """Immutable snapshot of ``Settings``.
+
+    Config is read-only after startup; a slotted dataclass serves hot-path
+    attribute reads from C-level slots instead of Pydantic's descriptor
+    machinery.  Field names mirror ``Settings`` so call sites are unchanged.
+    """
+
+    app_env: str
+    app_name: str
+    app_version: str
+    api_prefix: str
+    log_level: str
+    database_url: str
+    redis_url: str
+    vector_provider: str
+    pinecone_api_key: str
+    pinecone_index: str
+    pinecone_environment: str
+    rate_limit: str
+
+
 @lru_cache(maxsize=1)
-def get_settings() -> Settings:
-    return Settings()
+def get_settings() -> FrozenSettings:
+    return FrozenSettings(**Settings().model_dump())
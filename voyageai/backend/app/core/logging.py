@@ -12,6 +12,7 @@ def configure_logging() -> None:
             structlog.processors.TimeStamper(fmt='iso'),
             structlog.processors.JSONRenderer(),
         ],
+        cache_logger_on_first_use=True,
     )
 
 
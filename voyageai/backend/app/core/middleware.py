@@ -6,12 +6,16 @@ from app.core.logging import get_logger
 
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app) -> None:
+        super().__init__(app)
+        # Bound once — no logger construction on the per-request path
+        self._logger = get_logger('request')
+
     async def dispatch(self, request: Request, call_next):
-        logger = get_logger('request')
         start = perf_counter()
         response: Response = await call_next(request)
         duration_ms = round((perf_counter() - start) * 1000, 2)
-        logger.info(
+        self._logger.info(
             'request_complete',
             method=request.method,
             path=request.url.path,
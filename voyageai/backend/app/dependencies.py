@@ -11,5 +11,6 @@ def get_cache() -> RedisCache:
 
 
 def get_travel_service() -> TravelService:
-    """Create a fresh TravelService each request (graph is lightweight)."""
+    """Create a fresh TravelService each request (the compiled graph is
+    a process-wide singleton, so construction is cheap)."""
     return TravelService(get_cache())
@@ -5,7 +5,8 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
-import json
+import asyncio
+import orjson
 import time
 
 from app.config import get_settings
@@ -13,7 +14,16 @@ from app.core.logging import configure_logging
 from app.core.middleware import RequestLoggingMiddleware
 from app.dependencies import get_travel_service
 from app.schemas.travel import TravelPrompt, TravelResponse
-from app.services.travel_service import TravelService
+from app.services.travel_service import TravelService, _coalesce_progress
+
+# Prefer the libuv event loop for the mostly-async workload; uvicorn's
+# `--loop uvloop --http httptools` picks it up too, this covers embedded
+# runs (tests, scripts).  uvloop has no Windows build, hence the guard.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:  # pragma: no cover
+    pass
 
 configure_logging()
 settings = get_settings()
@@ -60,11 +70,16 @@ async def create_plan_stream(
 
     async def event_generator():
         try:
-            async for event in travel_service.plan_stream(payload):
-                yield f"data: {json.dumps(event)}\n\n"
+            # Coalesce progress frames emitted within the same short
+            # window — the client only needs the latest progress value.
+            async for event in _coalesce_progress(travel_service.plan_stream(payload)):
+                # Result frames arrive pre-encoded (the plan JSON is
+                # spliced in by the service) — write them as-is.
+                encoded = event.get('encoded')
+                yield b'data: ' + (encoded if encoded is not None else orjson.dumps(event)) + b'\n\n'
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
-        yield "data: [DONE]\n\n"
+            yield b'data: ' + orjson.dumps({'type': 'error', 'message': str(e)}) + b'\n\n'
+        yield b'data: [DONE]\n\n'
 
     return StreamingResponse(
         event_generator(),
@@ -1,14 +1,66 @@
-import json
+import orjson
 import redis.asyncio as redis
 
+# Placeholder stored while a worker computes a value for a claimed key.
+# Starts with a NUL byte so it can never collide with JSON payloads.
+_INFLIGHT = b'\x00inflight'
+
 
 class RedisCache:
     def __init__(self, redis_url: str):
-        self._client = redis.from_url(redis_url, decode_responses=True)
+        # orjson emits/consumes bytes, so skip decode_responses round-trips
+        self._client = redis.from_url(redis_url)
 
-    async def get_json(self, key: str):
+    async def get_json(self, key: str | bytes):
         raw = await self._client.get(key)
-        return json.loads(raw) if raw else None
+        return orjson.loads(raw) if raw else None
+
+    async def set_json(self, key: str | bytes, value, ttl: int = 900):
+        await self._client.set(key, orjson.dumps(value), ex=ttl)
+
+    async def get_bytes(self, key: str | bytes) -> bytes | None:
+        """Raw read for callers that do their own (de)serialization."""
+        return await self._client.get(key)
+
+    async def set_bytes(self, key: str | bytes, value: bytes, ttl: int = 900):
+        """Raw write for pre-encoded payloads."""
+        await self._client.set(key, value, ex=ttl)
+
+    async def get_or_claim(self, key: str | bytes, claim_ttl: int = 60) -> tuple[bytes | None, bool]:
+        """Probe the cache and claim the key in a single round-trip.
+
+        Pipelines ``GET key`` with ``SET key <placeholder> NX EX ttl``.
+        Returns ``(value, False)`` on a hit, ``(None, True)`` when this
+        caller won the claim and should compute + write the real value,
+        and ``(None, False)`` when another worker holds the claim —
+        callers should back off and probe again.  The claim expires after
+        ``claim_ttl`` seconds so a crashed worker can't wedge the key.
+        """
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.set(key, _INFLIGHT, nx=True, ex=claim_ttl)
+            cached, claimed = await pipe.execute()
+        if cached is not None and cached != _INFLIGHT:
+            return cached, False
+        return None, bool(claimed)
+
+    async def release_claim(self, key: str | bytes):
+        """Drop a claim taken via get_or_claim when computation fails."""
+        await self._client.delete(key)
+
+    async def get_many_json(self, keys: list[str | bytes]) -> list:
+        """Fetch several keys in one MGET round-trip; missing keys map
+        to None in the returned list."""
+        if not keys:
+            return []
+        raws = await self._client.mget(keys)
+        return [orjson.loads(raw) if raw else None for raw in raws]
 
-    async def set_json(self, key: str, value, ttl: int = 900):
-        await self._client.set(key, json.dumps(value), ex=ttl)
+    async def set_many_json(self, items: dict, ttl: int = 900):
+        """Write several key/value pairs in one pipelined round-trip."""
+        if not items:
+            return
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, orjson.dumps(value), ex=ttl)
+            await pipe.execute()
@@ -1,24 +1,43 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
-from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
+from typing import Annotated, Dict, List, Literal, Optional, Union
+
+# Config for the pure-data leaf schemas below.  They are declared as
+# slotted pydantic dataclasses rather than BaseModels: no __dict__ and no
+# pydantic private state per instance, which matters because a single
+# plan allocates hundreds of them (one DayItinerary per day, one
+# CarbonLeg per leg, one WeatherInsight per city, ...).
+_LEAF_CONFIG = ConfigDict(extra='forbid', defer_build=True)
+
+
+class _DeferredModel(BaseModel):
+    """Shared base that defers core-schema construction.
+
+    Building the Rust validator/serializer for every model here at import
+    time dominates cold-start cost; with ``defer_build=True`` each schema
+    is built on first actual use instead (``TravelService`` rebuilds the
+    response tree once up front so request paths never pay the lazy hit).
+    """
+    model_config = ConfigDict(defer_build=True)
 
 
 # ---------------------------------------------------------------------------
 # REQUEST MODELS
 # ---------------------------------------------------------------------------
 
-class TravelPrompt(BaseModel):
+class TravelPrompt(_DeferredModel):
     """Raw natural-language trip description from the user."""
     prompt: str = Field(..., min_length=3, description="Natural language trip description")
 
 
-class BudgetRange(BaseModel):
+class BudgetRange(_DeferredModel):
     min: Optional[float] = None
     max: Optional[float] = None
 
 
-class UserIntent(BaseModel):
+class UserIntent(_DeferredModel):
     """Structured fields extracted from a natural-language prompt."""
     origin_city: Optional[str] = None
     destinations: List[str] = Field(default_factory=list)
@@ -40,7 +59,8 @@ class UserIntent(BaseModel):
 # PLAN OUTPUT MODELS
 # ---------------------------------------------------------------------------
 
-class DayItinerary(BaseModel):
+@dataclass(config=_LEAF_CONFIG, slots=True)
+class DayItinerary:
     day: int
     city: str
     activities: List[str] = Field(default_factory=list)
@@ -48,23 +68,25 @@ class DayItinerary(BaseModel):
     weather_note: str = ""
 
 
-class TransportPlan(BaseModel):
+class TransportPlan(_DeferredModel):
     recommended_passes: List[str] = Field(default_factory=list)
     route_order: List[str] = Field(default_factory=list)
 
 
-class StayRecommendation(BaseModel):
+@dataclass(config=_LEAF_CONFIG, slots=True)
+class StayRecommendation:
     city: str
     stay_type: str
     budget_per_night_inr: float
 
 
-class VisaInformation(BaseModel):
+class VisaInformation(_DeferredModel):
     required: bool = False
     details: str = ""
 
 
-class CostBreakdown(BaseModel):
+@dataclass(config=_LEAF_CONFIG, slots=True)
+class CostBreakdown:
     flights_estimated: float = 0
     accommodation_estimated: float = 0
     activities_estimated: float = 0
@@ -72,7 +94,8 @@ class CostBreakdown(BaseModel):
     total_estimated: float = 0
 
 
-class RemoteWorkSpot(BaseModel):
+@dataclass(config=_LEAF_CONFIG, slots=True)
+class RemoteWorkSpot:
     city: str
     recommendations: List[str] = Field(default_factory=list)
 
@@ -81,7 +104,8 @@ class RemoteWorkSpot(BaseModel):
 # NEW: Carbon Footprint
 # ---------------------------------------------------------------------------
 
-class CarbonLeg(BaseModel):
+@dataclass(config=_LEAF_CONFIG, slots=True)
+class CarbonLeg:
     """CO₂ estimate for a single travel leg."""
     leg: str = ""
     mode: str = "flight"
@@ -89,7 +113,7 @@ class CarbonLeg(BaseModel):
     co2_kg: float = 0
 
 
-class CarbonFootprint(BaseModel):
+class CarbonFootprint(_DeferredModel):
     """Total trip carbon footprint with per-leg breakdown."""
     total_co2_kg: float = 0
     rating: str = "moderate"           # low / moderate / high
@@ -102,7 +126,8 @@ class CarbonFootprint(BaseModel):
 # NEW: Confidence Scoring
 # ---------------------------------------------------------------------------
 
-class ConfidenceScores(BaseModel):
+@dataclass(config=_LEAF_CONFIG, slots=True)
+class ConfidenceScores:
     """Per-agent confidence scores (0-1) plus overall."""
     overall: float = 0.0
     intent_parsing: float = 0.0
@@ -118,7 +143,8 @@ class ConfidenceScores(BaseModel):
 # NEW: Weather Insights
 # ---------------------------------------------------------------------------
 
-class WeatherInsight(BaseModel):
+@dataclass(config=_LEAF_CONFIG, slots=True)
+class WeatherInsight:
     city: str
     avg_temp_c: float = 22
     rain_chance: float = 0.2
@@ -131,7 +157,7 @@ class WeatherInsight(BaseModel):
 # PLAN
 # ---------------------------------------------------------------------------
 
-class TravelPlan(BaseModel):
+class TravelPlan(_DeferredModel):
     summary: str = ""
     route_strategy: str = ""
     day_by_day_itinerary: List[DayItinerary] = Field(default_factory=list)
@@ -149,7 +175,7 @@ class TravelPlan(BaseModel):
 # API RESPONSE
 # ---------------------------------------------------------------------------
 
-class TravelResponse(BaseModel):
+class TravelResponse(_DeferredModel):
     intent: UserIntent
     plan: TravelPlan
     risk_score: float = 0
@@ -163,14 +189,42 @@ class TravelResponse(BaseModel):
 # LEGACY COMPAT (kept for internal agent use)
 # ---------------------------------------------------------------------------
 
-class ItineraryItem(BaseModel):
+class _ItineraryItemBase(_DeferredModel):
     day: int
     activity: str
     location: str
     estimated_cost: float
-    category: Literal['flight', 'hotel', 'experience', 'transport', 'misc']
 
 
-class AgentLog(BaseModel):
+class FlightItem(_ItineraryItemBase):
+    category: Literal['flight'] = 'flight'
+
+
+class HotelItem(_ItineraryItemBase):
+    category: Literal['hotel'] = 'hotel'
+
+
+class ExperienceItem(_ItineraryItemBase):
+    category: Literal['experience'] = 'experience'
+
+
+class TransportItem(_ItineraryItemBase):
+    category: Literal['transport'] = 'transport'
+
+
+class MiscItem(_ItineraryItemBase):
+    category: Literal['misc'] = 'misc'
+
+
+# Discriminated union: validation dispatches on the category tag in one
+# lookup instead of trying each variant, and the per-category models can
+# grow their own fields without touching callers.
+ItineraryItem = Annotated[
+    Union[FlightItem, HotelItem, ExperienceItem, TransportItem, MiscItem],
+    Field(discriminator='category'),
+]
+
+
+class AgentLog(_DeferredModel):
     agent: str
     message: str
@@ -3,7 +3,7 @@ LangGraph multi-agent orchestration.
 
 Pipeline:
   Intent Extraction → Memory → Planner (Route Optimizer)
-  → Flight Intelligence → Hotel Intelligence → Experience Curator
+  → { Flight ∥ Hotel ∥ Experience }  (parallel fan-out)
   → Budget Optimizer → Carbon Footprint → Risk + Visa + Weather
   → Confidence Scoring → Validation → END
 """
@@ -65,10 +65,14 @@ class TravelGraphService:
         graph.set_entry_point('intent_extractor')
         graph.add_edge('intent_extractor', 'memory')
         graph.add_edge('memory', 'planner')
+        # Flight / hotel / experience only depend on planner output, so
+        # fan them out in parallel and join before the budget pass.  The
+        # branch agents return partial updates (their own keys only) so
+        # the concurrent writes merge without channel conflicts.
         graph.add_edge('planner', 'flight')
-        graph.add_edge('flight', 'hotel')
-        graph.add_edge('hotel', 'experience')
-        graph.add_edge('experience', 'budget')
+        graph.add_edge('planner', 'hotel')
+        graph.add_edge('planner', 'experience')
+        graph.add_edge(['flight', 'hotel', 'experience'], 'budget')
         graph.add_edge('budget', 'carbon')
         graph.add_edge('carbon', 'risk')
         graph.add_edge('risk', 'confidence')
@@ -4,26 +4,41 @@ Travel Service — orchestrates the graph and maps the result to the API schema.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import sys
 import time
+from functools import lru_cache
 from typing import AsyncGenerator
 
+import orjson
+from pydantic import TypeAdapter
+
 from app.schemas.travel import (
+    BudgetRange,
     CarbonFootprint,
+    CarbonLeg,
     ConfidenceScores,
     CostBreakdown,
+    DayItinerary,
+    RemoteWorkSpot,
+    StayRecommendation,
     TransportPlan,
     TravelPlan,
     TravelPrompt,
     TravelResponse,
     UserIntent,
     VisaInformation,
+    WeatherInsight,
 )
 from app.schemas.state import TravelGraphState
 from app.services.travel_graph import TravelGraphService
 from app.memory.cache import RedisCache
 
-# Human-readable labels for each agent node
+# Human-readable labels for each agent node.  Keys are interned so the
+# per-event lookup in plan_stream resolves by pointer comparison —
+# LangGraph's node names come from our own literals, which CPython
+# interns too.
 _AGENT_LABELS: dict[str, str] = {
     'intent_extractor': 'Parsing your trip description...',
     'memory': 'Loading travel memory...',
@@ -37,19 +52,172 @@ _AGENT_LABELS: dict[str, str] = {
     'confidence': 'Scoring confidence levels...',
     'validation': 'Validating final plan...',
 }
+_AGENT_LABELS = {sys.intern(k): v for k, v in _AGENT_LABELS.items()}
 
 _AGENT_ORDER = list(_AGENT_LABELS.keys())
+_TOTAL_STEPS = len(_AGENT_ORDER)
+
+# Progress percentage after each completed step, precomputed so the
+# streaming loop indexes a tuple instead of dividing and rounding per
+# event.  The capped ladder tops out at 99 — only the final 'done'
+# frame reads 100.
+_PROGRESS_LADDER = tuple(round(i / _TOTAL_STEPS * 100) for i in range(1, _TOTAL_STEPS + 1))
+_PROGRESS_LADDER_CAPPED = tuple(min(p, 99) for p in _PROGRESS_LADDER)
+
+# Envelope prefix for pre-encoded SSE result frames; the response blob
+# is spliced in between this and the closing brace.
+_RESULT_PREFIX = b'{"type":"result","data":'
+
+
+@lru_cache(maxsize=4096)
+def _cache_key(prompt: str) -> bytes:
+    """Redis key for a prompt: 128-bit blake2b fingerprint, memoized so
+    repeat prompts skip even the hash.  Bytes, so redis-py skips the
+    utf-8 encode on every command that uses the key."""
+    return b'trip:' + hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest().encode()
+
+
+async def _coalesce_progress(
+    stream: AsyncGenerator[dict, None], interval: float = 0.03,
+) -> AsyncGenerator[dict, None]:
+    """Batch progress frames that land within a short window.
+
+    Progress is latest-value-wins, so when several nodes finish inside
+    one interval (the flight/hotel/experience fan-out routinely does)
+    only the newest frame needs to reach the client — fewer SSE packets
+    and JSON encodes for the same visible progress.  ``result``/``error``
+    frames and the final 100% frame are never held back.
+    """
+    pending: dict | None = None
+    ait = stream.__aiter__()
+    get_next = asyncio.ensure_future(ait.__anext__())
+    timer: asyncio.Task | None = None
+    try:
+        while True:
+            waits = {get_next}
+            if pending is not None:
+                if timer is None:
+                    timer = asyncio.ensure_future(asyncio.sleep(interval))
+                waits.add(timer)
+            done, _ = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+            if timer is not None and timer in done:
+                yield pending
+                pending = None
+                timer = None
+            if get_next not in done:
+                continue
+            try:
+                event = get_next.result()
+            except StopAsyncIteration:
+                break
+            if event['type'] == 'progress' and event.get('progress', 100) < 100:
+                pending = event  # supersedes anything buffered
+            else:
+                if timer is not None:
+                    timer.cancel()
+                    timer = None
+                pending = None
+                yield event
+            get_next = asyncio.ensure_future(ait.__anext__())
+        if pending is not None:
+            yield pending
+    finally:
+        get_next.cancel()
+        if timer is not None:
+            timer.cancel()
+
+
+@lru_cache(maxsize=1)
+def _compiled_graph():
+    """Compile the agent graph once per process.
+
+    ``StateGraph.compile()`` walks and validates every node/edge and
+    builds the Pregel runnable — far too heavy to repeat for each
+    request-scoped TravelService.  The compiled graph is stateless
+    across invocations, so sharing it is safe.
+    """
+    return TravelGraphService().build()
+
+
+@lru_cache(maxsize=1)
+def _response_adapter() -> TypeAdapter[TravelResponse]:
+    """Serializer for cache writes, built on first use.
+
+    ``dump_json`` emits bytes in one pydantic-core pass — no intermediate
+    dict and no str→bytes encode.  Lazy so the schema build happens once,
+    at service init, rather than at module import (the schemas use
+    ``defer_build``).
+    """
+    return TypeAdapter(TravelResponse)
+
+
+def _construct_response(d: dict) -> TravelResponse:
+    """Rebuild a TravelResponse from a trusted cache blob.
+
+    The blob is our own ``model_dump()`` output, schema-validated on
+    write, so ``model_construct`` skips the full recursive pydantic-core
+    validation pass on every cache hit.  The slotted dataclass leaves
+    (DayItinerary, CarbonLeg, ...) have no ``model_construct``; their
+    plain constructors only touch scalar fields, which is cheap.
+    """
+    intent_d = d['intent']
+    plan_d = d['plan']
+    carbon_d = plan_d['carbon_footprint']
+    return TravelResponse.model_construct(
+        intent=UserIntent.model_construct(**{
+            **intent_d,
+            'budget_range_inr': BudgetRange.model_construct(**intent_d['budget_range_inr']),
+        }),
+        plan=TravelPlan.model_construct(
+            summary=plan_d['summary'],
+            route_strategy=plan_d['route_strategy'],
+            day_by_day_itinerary=[
+                DayItinerary(**x) for x in plan_d['day_by_day_itinerary']
+            ],
+            transport_plan=TransportPlan.model_construct(**plan_d['transport_plan']),
+            stay_recommendations=[
+                StayRecommendation(**x) for x in plan_d['stay_recommendations']
+            ],
+            visa_information=VisaInformation.model_construct(**plan_d['visa_information']),
+            cost_breakdown=CostBreakdown(**plan_d['cost_breakdown']),
+            remote_work_friendly_spots=[
+                RemoteWorkSpot(**x) for x in plan_d['remote_work_friendly_spots']
+            ],
+            optimization_score=plan_d['optimization_score'],
+            carbon_footprint=CarbonFootprint.model_construct(**{
+                **carbon_d,
+                'legs': [CarbonLeg(**leg) for leg in carbon_d['legs']],
+            }),
+            weather_insights=[
+                WeatherInsight(**x) for x in plan_d['weather_insights']
+            ],
+        ),
+        risk_score=d['risk_score'],
+        confidence=ConfidenceScores(**d['confidence']),
+        optimization_summary=d['optimization_summary'],
+        agent_logs=d['agent_logs'],
+        processing_time_ms=d['processing_time_ms'],
+    )
 
 
 class TravelService:
     def __init__(self, cache: RedisCache) -> None:
         self.cache = cache
-        self._graph_svc = TravelGraphService()
-        self.graph = self._graph_svc.build()
-
-    def _build_initial_state(self, prompt: str) -> TravelGraphState:
-        return {
-            'raw_prompt': prompt,
+        self.graph = _compiled_graph()
+        # Schemas are declared with defer_build=True; force the response
+        # tree (which pulls in every nested plan model) to build once here
+        # so no request pays the first-use schema-construction cost.
+        TravelResponse.model_rebuild()
+        _response_adapter()
+        # Scaffolding for per-request state.  The pydantic placeholders
+        # (UserIntent, TransportPlan, ...) are only ever *replaced* by the
+        # agents, never mutated, so sharing one instance across requests
+        # is safe and saves building them all on every call.  The one
+        # exception — cost_breakdown, which agents write into in place —
+        # gets a fresh instance in _build_initial_state, as do the mutable
+        # containers.
+        self._state_template: TravelGraphState = {
+            'raw_prompt': '',
             'intent': UserIntent(),
             'flight_options': [],
             'hotel_options': [],
@@ -76,6 +244,39 @@ class TravelService:
             'validation_errors': [],
         }
 
+    def _build_initial_state(self, prompt: str) -> TravelGraphState:
+        state = self._state_template.copy()
+        state['raw_prompt'] = prompt
+        state['flight_options'] = []
+        state['hotel_options'] = []
+        state['experiences'] = []
+        state['weather_data'] = {}
+        state['visa_data'] = {}
+        state['day_by_day_itinerary'] = []
+        state['stay_recommendations'] = []
+        state['cost_breakdown'] = CostBreakdown()
+        state['remote_work_spots'] = []
+        state['weather_insights'] = []
+        state['logs'] = []
+        state['validation_errors'] = []
+        return state
+
+    async def _get_or_claim(self, cache_key: str) -> tuple[bytes | None, bool]:
+        """Single-flight cache probe (one Redis round-trip per attempt).
+
+        On a miss the key is claimed atomically; if another worker is
+        already running the graph for the same prompt, back off and poll
+        until its result lands (or its claim expires and we take over)
+        instead of executing the full graph a second time.
+        """
+        blob, claimed = await self.cache.get_or_claim(cache_key)
+        delay = 0.05
+        while blob is None and not claimed:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+            blob, claimed = await self.cache.get_or_claim(cache_key)
+        return blob, claimed
+
     def _build_response(self, result: dict, elapsed_ms: float) -> TravelResponse:
         return TravelResponse(
             intent=result['intent'],
@@ -100,18 +301,31 @@ class TravelService:
         )
 
     async def plan(self, prompt: TravelPrompt) -> TravelResponse:
-        cache_key = 'trip:' + hashlib.sha256(prompt.prompt.encode()).hexdigest()
-        cached = await self.cache.get_json(cache_key)
-        if cached:
-            return TravelResponse.model_validate(cached)
+        cache_key = _cache_key(prompt.prompt)
+        blob, _ = await self._get_or_claim(cache_key)
+        if blob:
+            return _construct_response(orjson.loads(blob))
 
-        start_time = time.perf_counter()
-        initial_state = self._build_initial_state(prompt.prompt)
-        result = await self.graph.ainvoke(initial_state)
-        elapsed_ms = round((time.perf_counter() - start_time) * 1000, 1)
+        try:
+            start_time = time.perf_counter()
+            initial_state = self._build_initial_state(prompt.prompt)
+            result = await self.graph.ainvoke(initial_state)
+            elapsed_ms = round((time.perf_counter() - start_time) * 1000, 1)
 
-        response = self._build_response(result, elapsed_ms)
-        await self.cache.set_json(cache_key, response.model_dump())
+            response = self._build_response(result, elapsed_ms)
+        except Exception:
+            # Don't leave the in-flight placeholder wedging waiters
+            # until the claim TTL expires.
+            await self.cache.release_claim(cache_key)
+            raise
+        # Serialize straight from pydantic-core — no intermediate dict —
+        # and hand the bytes to Redis as-is.  Interoperates with the
+        # orjson-encoded blobs plan_stream writes under the same key.
+        # None-valued optionals are omitted (readers fall back to the
+        # field defaults, which are the same Nones).
+        await self.cache.set_bytes(
+            cache_key, _response_adapter().dump_json(response, exclude_none=True)
+        )
         return response
 
     async def plan_stream(
@@ -122,32 +336,46 @@ class TravelService:
 
         Yields dicts of shape:
           {"type": "progress", "agent": ..., "label": ..., "progress": ..., "step": ..., "total_steps": ...}
-          {"type": "result", "data": {...}}  — final plan
+          {"type": "result", "encoded": b'{"type":"result","data":{...}}'}
+              — final plan, pre-encoded so the SSE route can write the
+                bytes straight to the wire (the on-wire frame carries
+                the plan under "data")
           {"type": "error", "message": ...}  — on failure
 
         Uses LangGraph's ``astream()`` to yield after each real node
         completes, so progress events reflect actual computation.
         """
-        cache_key = 'trip:' + hashlib.sha256(prompt.prompt.encode()).hexdigest()
-        cached = await self.cache.get_json(cache_key)
-        if cached:
-            # Even for cached results, send a quick progress burst
-            total = len(_AGENT_ORDER)
-            for i, agent in enumerate(_AGENT_ORDER):
-                yield {
-                    'type': 'progress',
-                    'agent': agent,
-                    'label': _AGENT_LABELS.get(agent, agent),
-                    'progress': round(((i + 1) / total) * 100),
-                    'step': i + 1,
-                    'total_steps': total,
-                }
-            yield {'type': 'result', 'data': cached}
+        cache_key = _cache_key(prompt.prompt)
+        total = len(_AGENT_ORDER)
+        # Single mutable frame per stream; each emission updates it and
+        # yields a shallow copy (the coalescer buffers frames across
+        # yields, so the copy is required) instead of building a fresh
+        # 6-key dict literal every time.
+        frame = {
+            'type': 'progress',
+            'agent': '',
+            'label': '',
+            'progress': 0,
+            'step': 0,
+            'total_steps': total,
+        }
+
+        blob, _ = await self._get_or_claim(cache_key)
+        if blob:
+            # One frame instead of a per-agent burst — cache hits are the
+            # hottest path, and the client only needs the final number.
+            frame['agent'] = 'cache'
+            frame['label'] = 'Plan loaded from cache'
+            frame['progress'] = 100
+            frame['step'] = total
+            yield frame.copy()
+            # The cached blob is already JSON — splice it into the result
+            # envelope without ever decoding it.
+            yield {'type': 'result', 'encoded': _RESULT_PREFIX + blob + b'}'}
             return
 
         start_time = time.perf_counter()
         initial_state = self._build_initial_state(prompt.prompt)
-        total = len(_AGENT_ORDER)
         step = 0
         final_state: dict = {}
 
@@ -157,15 +385,16 @@ class TravelService:
                 for node_name in event:
                     final_state.update(event[node_name])
                     step += 1
-                    progress = round((step / total) * 100)
-                    yield {
-                        'type': 'progress',
-                        'agent': node_name,
-                        'label': _AGENT_LABELS.get(node_name, f'Running {node_name}...'),
-                        'progress': min(progress, 99),
-                        'step': step,
-                        'total_steps': total,
-                    }
+                    # Interned-key hit is a pointer compare; the f-string
+                    # fallback is only built for genuinely unknown nodes.
+                    label = _AGENT_LABELS.get(sys.intern(node_name))
+                    frame['agent'] = node_name
+                    frame['label'] = label if label is not None else f'Running {node_name}...'
+                    frame['progress'] = (
+                        _PROGRESS_LADDER_CAPPED[step - 1] if step <= _TOTAL_STEPS else 99
+                    )
+                    frame['step'] = step
+                    yield frame.copy()
 
             elapsed_ms = round((time.perf_counter() - start_time) * 1000, 1)
 
@@ -174,18 +403,21 @@ class TravelService:
             merged = {**initial_state, **final_state}
             response = self._build_response(merged, elapsed_ms)
 
-            yield {
-                'type': 'progress',
-                'agent': 'done',
-                'label': 'Plan complete!',
-                'progress': 100,
-                'step': total,
-                'total_steps': total,
-            }
-            result_data = response.model_dump()
-            yield {'type': 'result', 'data': result_data}
+            frame['agent'] = 'done'
+            frame['label'] = 'Plan complete!'
+            frame['progress'] = 100
+            frame['step'] = total
+            yield frame.copy()
+            # One pydantic-core pass produces the JSON bytes; the same
+            # blob is spliced into the SSE result envelope and written to
+            # the cache, so the tree is never re-encoded (or dumped to an
+            # intermediate dict) at all.  None-valued optionals are
+            # omitted; clients treat the missing fields as null.
+            result_blob = _response_adapter().dump_json(response, exclude_none=True)
+            yield {'type': 'result', 'encoded': _RESULT_PREFIX + result_blob + b'}'}
 
-            await self.cache.set_json(cache_key, result_data)
+            await self.cache.set_bytes(cache_key, result_blob)
 
         except Exception as e:
+            await self.cache.release_claim(cache_key)
             yield {'type': 'error', 'message': str(e)}
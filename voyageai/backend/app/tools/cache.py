@@ -0,0 +1,56 @@
+"""
+Async memoization for the tools layer.
+
+Mock (and eventually real) API lookups are keyed by small string
+arguments and change rarely, so a process-wide TTL cache turns repeat
+fetches across graph runs into a dict lookup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable
+
+
+def async_ttl_cache(ttl_seconds: float, maxsize: int = 256):
+    """Memoize an async function per normalized argument tuple.
+
+    String arguments are lowercased/stripped for the key, so
+    ``search_hotels('Goa ')`` and ``search_hotels('goa')`` share an
+    entry.  Entries store the in-flight task itself: concurrent callers
+    with the same key await one shared task (single-flight), so a burst
+    of identical requests triggers exactly one upstream call.  Failed or
+    cancelled tasks are evicted immediately — errors are never cached.
+    """
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        cache: dict[tuple, tuple[float, asyncio.Task]] = {}
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = tuple(
+                a.lower().strip() if isinstance(a, str) else a
+                for a in args
+            ) + tuple(sorted(
+                (k, v.lower().strip() if isinstance(v, str) else v)
+                for k, v in kwargs.items()
+            ))
+            now = time.monotonic()
+            entry = cache.get(key)
+            if entry is None or entry[0] <= now:
+                if len(cache) >= maxsize:
+                    for stale in [k for k, (exp, _) in cache.items() if exp <= now]:
+                        del cache[stale]
+                task = asyncio.ensure_future(fn(*args, **kwargs))
+                task.add_done_callback(
+                    lambda t, k=key: (t.cancelled() or t.exception()) and cache.pop(k, None)
+                )
+                entry = (now + ttl_seconds, task)
+                cache[key] = entry
+            return await entry[1]
+
+        wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -8,16 +8,65 @@ functions with real HTTP calls (Amadeus, Booking, Mapbox, …) when ready.
 
 from __future__ import annotations
 
-import hashlib
-import math
+import asyncio
+import sys
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
+from app.tools.cache import async_ttl_cache
+
 
 # ── helpers ────────────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=2048)
+def _norm(city: str) -> str:
+    """Canonical lowercase key for a city string, memoized and interned.
+
+    Repeat lookups with the same raw string skip the lower/strip
+    allocation entirely, and the interned result lets the lookup dicts
+    hit the pointer-compare fast path.
+    """
+    return sys.intern(city.lower().strip())
+
+
+@lru_cache(maxsize=1024)
 def _city_hash(city: str) -> int:
-    """Stable numeric hash for a city name (used for deterministic variance)."""
-    return int(hashlib.md5(city.lower().encode()).hexdigest()[:8], 16)
+    """Stable numeric hash for a city name (used for deterministic variance).
+
+    crc32 gives a 32-bit int straight from C — no cryptographic digest,
+    no hex string round-trip — which matters on a path hit by every
+    flight/hotel/weather lookup.  Memoized because the agents re-enter
+    these lookups with the same handful of cities per trip.
+    """
+    return zlib.crc32(city.lower().encode())
+
+
+# ── per-city record ────────────────────────────────────────────────────────
+
+@dataclass(slots=True, frozen=True)
+class CityRecord:
+    """All mock data for one city, merged from the source tables below.
+
+    A full plan used to probe half a dozen scattered dicts per city
+    (flight base, hotel base, weather, visa country, …); one ``_CITIES``
+    lookup now fetches everything.  ``slots=True`` keeps the record
+    compact and ``frozen=True`` enforces the shared/read-only contract.
+    """
+
+    flight_base: float = 35000.0
+    hotel_base: float = 4500.0
+    transport: float = 400.0
+    weather: dict[str, Any] | None = None
+    visa_country: str = ''
+    activities: tuple[dict[str, Any], ...] = ()
+    remote_spots: tuple[str, ...] = ()
+
+
+# Populated at module finalization (bottom of file), once every source
+# table exists.
+_CITIES: dict[str, CityRecord] = {}
 
 
 # ── flights ────────────────────────────────────────────────────────────────
@@ -40,29 +89,41 @@ _FLIGHT_BASES_INR: dict[str, float] = {
 }
 
 
-async def search_flights(origin: str, destination: str) -> list[dict[str, Any]]:
-    base = _FLIGHT_BASES_INR.get(destination.lower(), 35000)
+@lru_cache(maxsize=4096)
+def _build_flights(origin: str, destination: str) -> tuple[dict[str, Any], ...]:
+    """Deterministic flight options for a leg, built once per pair.
+
+    The option dicts are shared across calls and must be treated as
+    read-only; agents only read and copy references, never mutate.
+    """
+    rec = _CITIES.get(_norm(destination))
+    base = rec.flight_base if rec is not None else 35000.0
     h = _city_hash(origin + destination)
-    return [
+    return (
         {
             'carrier': 'SkyFast',
-            'price_inr': round(base * 0.92 + (h % 2000)),
-            'duration_hours': round(5 + (h % 8), 1),
+            'price_inr': int(base * 0.92) + (h % 2000),
+            'duration_hours': 5 + (h % 8),
             'stops': 1,
         },
         {
             'carrier': 'AeroMax',
-            'price_inr': round(base * 1.05 + (h % 1500)),
-            'duration_hours': round(4 + (h % 6), 1),
+            'price_inr': int(base * 1.05) + (h % 1500),
+            'duration_hours': 4 + (h % 6),
             'stops': 0,
         },
         {
             'carrier': 'BudgetWings',
-            'price_inr': round(base * 0.78 + (h % 1000)),
-            'duration_hours': round(7 + (h % 10), 1),
+            'price_inr': int(base * 0.78) + (h % 1000),
+            'duration_hours': 7 + (h % 10),
             'stops': 2,
         },
-    ]
+    )
+
+
+@async_ttl_cache(ttl_seconds=600)   # 10 min
+async def search_flights(origin: str, destination: str) -> list[dict[str, Any]]:
+    return list(_build_flights(origin, destination))
 
 
 # ── hotels ─────────────────────────────────────────────────────────────────
@@ -80,40 +141,51 @@ _HOTEL_BASES_INR: dict[str, float] = {
 }
 
 
-async def search_hotels(destination: str) -> list[dict[str, Any]]:
-    base = _HOTEL_BASES_INR.get(destination.lower(), 4500)
+@lru_cache(maxsize=1024)
+def _build_hotels(destination: str) -> tuple[dict[str, Any], ...]:
+    """Deterministic hotel options per destination; dicts are shared and
+    read-only, same contract as ``_build_flights``."""
+    rec = _CITIES.get(_norm(destination))
+    base = rec.hotel_base if rec is not None else 4500.0
     h = _city_hash(destination)
-    return [
+    title = destination.title()
+    return (
         {
-            'name': f'{destination.title()} Grand Palace',
-            'nightly_rate_inr': round(base * 1.8 + (h % 500)),
+            'name': f'{title} Grand Palace',
+            'nightly_rate_inr': int(base * 1.8) + (h % 500),
             'rating': 4.7,
             'type': 'luxury hotel',
         },
         {
-            'name': f'{destination.title()} Central Suites',
-            'nightly_rate_inr': round(base * 1.15 + (h % 300)),
+            'name': f'{title} Central Suites',
+            'nightly_rate_inr': int(base * 1.15) + (h % 300),
             'rating': 4.4,
             'type': 'boutique hotel',
         },
         {
-            'name': f'{destination.title()} Budget Inn',
-            'nightly_rate_inr': round(base * 0.65 + (h % 200)),
+            'name': f'{title} Budget Inn',
+            'nightly_rate_inr': int(base * 0.65) + (h % 200),
             'rating': 4.0,
             'type': 'budget hotel',
         },
         {
-            'name': f'{destination.title()} Backpacker Hostel',
-            'nightly_rate_inr': round(base * 0.3 + (h % 150)),
+            'name': f'{title} Backpacker Hostel',
+            'nightly_rate_inr': int(base * 0.3) + (h % 150),
             'rating': 3.8,
             'type': 'hostel',
         },
-    ]
+    )
+
+
+@async_ttl_cache(ttl_seconds=600)   # 10 min
+async def search_hotels(destination: str) -> list[dict[str, Any]]:
+    return list(_build_hotels(destination))
 
 
 # ── activities / experiences ───────────────────────────────────────────────
 
-_CITY_ACTIVITIES: dict[str, list[dict[str, Any]]] = {
+# Values are converted to immutable tuples at module load (see bottom).
+_CITY_ACTIVITIES: dict[str, tuple[dict[str, Any], ...]] = {
     'tokyo': [
         {'name': 'Shibuya Crossing & Harajuku walk', 'cost_inr': 0, 'score': 9.3, 'type': 'free'},
         {'name': 'Tsukiji Outer Market food tour', 'cost_inr': 3500, 'score': 9.5, 'type': 'food'},
@@ -224,7 +296,7 @@ _CITY_ACTIVITIES: dict[str, list[dict[str, Any]]] = {
     ],
 }
 
-_DEFAULT_ACTIVITIES: list[dict[str, Any]] = [
+_DEFAULT_ACTIVITIES: tuple[dict[str, Any], ...] = [
     {'name': 'City walking tour', 'cost_inr': 0, 'score': 8.5, 'type': 'free'},
     {'name': 'Cultural heritage museum', 'cost_inr': 800, 'score': 8.2, 'type': 'culture'},
     {'name': 'Local food market exploration', 'cost_inr': 1200, 'score': 9.0, 'type': 'food'},
@@ -236,13 +308,84 @@ _DEFAULT_ACTIVITIES: list[dict[str, Any]] = [
 ]
 
 
-async def search_activities(destination: str) -> list[dict[str, Any]]:
-    key = destination.lower().strip()
-    return list(_CITY_ACTIVITIES.get(key, _DEFAULT_ACTIVITIES))
+@async_ttl_cache(ttl_seconds=1800)  # 30 min
+async def search_activities(destination: str) -> tuple[dict[str, Any], ...]:
+    """Activity pool for a city — the shared, read-only tuple itself.
+
+    Callers only iterate, so no per-call defensive copy is made.
+    """
+    rec = _CITIES.get(_norm(destination))
+    if rec is not None and rec.activities:
+        return rec.activities
+    return _DEFAULT_ACTIVITIES
+
+
+# ── batched variants ───────────────────────────────────────────────────────
+# One call per trip instead of one per city/leg.  The mock impls fan out
+# to the singleton functions; a real HTTP backend would POST the whole
+# array in one request and keep the same call-site shape.
+
+async def search_flights_batch(pairs: list[tuple[str, str]]) -> list[list[dict[str, Any]]]:
+    """Flight options for each (origin, destination) pair, in input order."""
+    return list(await asyncio.gather(*(search_flights(o, d) for o, d in pairs)))
+
+
+async def search_hotels_batch(destinations: list[str]) -> dict[str, list[dict[str, Any]]]:
+    """Hotel options keyed by the destination strings as passed in."""
+    results = await asyncio.gather(*(search_hotels(d) for d in destinations))
+    return dict(zip(destinations, results))
+
+
+async def search_activities_batch(cities: list[str]) -> dict[str, tuple[dict[str, Any], ...]]:
+    """Activity lists keyed by the city strings as passed in."""
+    results = await asyncio.gather(*(search_activities(c) for c in cities))
+    return dict(zip(cities, results))
+
+
+async def city_bundle(origin: str, destination: str) -> dict[str, Any]:
+    """Every mock lookup for one destination, fused into a single call.
+
+    One normalization and one ``_CITIES`` probe serve flights, hotels,
+    weather, visa, activities, remote-work spots and transport together.
+    The per-piece functions stay — the graph's parallel agent nodes each
+    own one slice — but a caller that wants the whole picture (or a real
+    backend that can answer in one request) goes through here.
+    """
+    rec = _CITIES.get(_norm(destination))
+    return {
+        'flights': list(_build_flights(origin, destination)),
+        'hotels': list(_build_hotels(destination)),
+        'weather': _build_weather(destination),
+        'visa': _build_visa(destination, None),
+        'activities': rec.activities if rec is not None and rec.activities else _DEFAULT_ACTIVITIES,
+        'remote_work_spots': list(rec.remote_spots) if rec is not None else [],
+        'daily_transport_inr': rec.transport if rec is not None else 400.0,
+    }
 
 
 # ── weather & risk ─────────────────────────────────────────────────────────
 
+_MONTHS = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December',
+)
+_MONTH_IDX = {m: i for i, m in enumerate(_MONTHS)}
+
+# March, April, October, November — matches the fallback list below.
+_DEFAULT_BEST_MASK = (1 << 2) | (1 << 3) | (1 << 9) | (1 << 10)
+
+
+@lru_cache(maxsize=64)
+def month_mask(month: str) -> int:
+    """Single-bit mask for a month name; 0 when the name is unknown.
+
+    Pairs with the ``best_months_mask`` field on weather profiles so a
+    "is this a best month?" check is one AND instead of a string scan.
+    """
+    idx = _MONTH_IDX.get(month.strip().title())
+    return 0 if idx is None else 1 << idx
+
+
 _WEATHER_PROFILES: dict[str, dict[str, Any]] = {
     'tokyo': {'avg_temp_c': 22, 'rain_chance': 0.3, 'storm_probability': 0.08, 'advisory_level': 'low', 'best_months': ['March', 'April', 'October', 'November']},
     'kyoto': {'avg_temp_c': 23, 'rain_chance': 0.28, 'storm_probability': 0.06, 'advisory_level': 'low', 'best_months': ['March', 'April', 'October', 'November']},
@@ -261,10 +404,13 @@ _WEATHER_PROFILES: dict[str, dict[str, Any]] = {
 }
 
 
-async def get_weather_risk(destination: str) -> dict[str, Any]:
-    key = destination.lower().strip()
-    if key in _WEATHER_PROFILES:
-        return {'destination': destination, **_WEATHER_PROFILES[key]}
+@lru_cache(maxsize=1024)
+def _build_weather(destination: str) -> dict[str, Any]:
+    """Weather profile for a city, built once; shared and read-only."""
+    rec = _CITIES.get(_norm(destination))
+    profile = rec.weather if rec is not None else None
+    if profile is not None:
+        return {'destination': destination, **profile}
     h = _city_hash(destination)
     return {
         'destination': destination,
@@ -273,9 +419,15 @@ async def get_weather_risk(destination: str) -> dict[str, Any]:
         'storm_probability': round(0.02 + (h % 15) / 100, 2),
         'advisory_level': 'low',
         'best_months': ['March', 'April', 'October', 'November'],
+        'best_months_mask': _DEFAULT_BEST_MASK,
     }
 
 
+async def get_weather_risk(destination: str) -> dict[str, Any]:
+    # async seam kept for the future real-API swap; the body is pure CPU.
+    return _build_weather(destination)
+
+
 # ── visa ───────────────────────────────────────────────────────────────────
 
 _VISA_DATA: dict[str, dict[str, Any]] = {
@@ -335,16 +487,27 @@ _CITY_TO_COUNTRY: dict[str, str] = {
 }
 
 
-async def get_visa_info(destination: str, country: str | None = None) -> dict[str, Any]:
-    key = destination.lower().strip()
-    cntry = (country or _CITY_TO_COUNTRY.get(key, '')).lower().strip()
+@lru_cache(maxsize=1024)
+def _build_visa(destination: str, country: str | None) -> dict[str, Any]:
+    """Visa details for a destination, built once; shared and read-only."""
+    if country:
+        cntry = _norm(country)
+    else:
+        rec = _CITIES.get(_norm(destination))
+        cntry = rec.visa_country if rec is not None else ''
     if cntry in _VISA_DATA:
         return _VISA_DATA[cntry]
     return {'required': True, 'details': f'Visa requirements for {destination} — please check with the nearest embassy.'}
 
 
+async def get_visa_info(destination: str, country: str | None = None) -> dict[str, Any]:
+    # async seam kept for the future real-API swap; the body is pure CPU.
+    return _build_visa(destination, country)
+
+
 def get_country_for_city(city: str) -> str | None:
-    return _CITY_TO_COUNTRY.get(city.lower().strip())
+    rec = _CITIES.get(_norm(city))
+    return (rec.visa_country or None) if rec is not None else None
 
 
 # ── currency conversion ───────────────────────────────────────────────────
@@ -359,10 +522,17 @@ _RATES_TO_INR: dict[str, float] = {
 }
 
 
+# Cross rates for every (from, to) pair, folded at import time so the
+# hot path is one dict probe and a multiply — no per-call division.
+# Built at module finalization; see bottom of file.
+_CROSS: dict[tuple[str, str], float] = {}
+
+
 async def convert_currency(amount: float, from_currency: str, to_currency: str = 'INR') -> float:
-    from_rate = _RATES_TO_INR.get(from_currency.lower(), 83.5)
-    to_rate = _RATES_TO_INR.get(to_currency.lower(), 1.0)
-    return round(amount * from_rate / to_rate, 2)
+    rate = _CROSS.get((_norm(from_currency), _norm(to_currency)))
+    if rate is None:  # unknown currency: assume USD → INR, as before
+        rate = _RATES_TO_INR.get(_norm(from_currency), 83.5) / _RATES_TO_INR.get(_norm(to_currency), 1.0)
+    return round(amount * rate, 2)
 
 
 # ── remote-work spots ─────────────────────────────────────────────────────
@@ -383,8 +553,12 @@ _REMOTE_WORK: dict[str, list[str]] = {
 }
 
 
+@async_ttl_cache(ttl_seconds=86400)  # 24 h
 async def get_remote_work_spots(destination: str) -> list[str]:
-    return _REMOTE_WORK.get(destination.lower().strip(), [f'Coworking space in {destination.title()}', f'{destination.title()} public library WiFi zone'])
+    rec = _CITIES.get(_norm(destination))
+    if rec is not None and rec.remote_spots:
+        return list(rec.remote_spots)
+    return [f'Coworking space in {destination.title()}', f'{destination.title()} public library WiFi zone']
 
 
 # ── local transport cost estimate ──────────────────────────────────────────
@@ -397,5 +571,63 @@ _DAILY_TRANSPORT_INR: dict[str, float] = {
 }
 
 
+@async_ttl_cache(ttl_seconds=21600)  # 6 h
 async def get_daily_transport_cost(destination: str) -> float:
-    return _DAILY_TRANSPORT_INR.get(destination.lower().strip(), 400)
+    rec = _CITIES.get(_norm(destination))
+    return rec.transport if rec is not None else 400.0
+
+
+# ── module finalization ────────────────────────────────────────────────────
+# Intern the keys of every fixed lookup table once at import.  _norm()
+# hands back interned strings, so the hot probes reduce to a hash hit
+# with pointer-equality — the nearest CPython gets to a compile-time
+# perfect-hash table.  Multi-word keys ('new york', 'kuala lumpur')
+# are not identifier-like, so CPython would not intern them on its own.
+for _table in (
+    _FLIGHT_BASES_INR, _HOTEL_BASES_INR, _CITY_ACTIVITIES,
+    _WEATHER_PROFILES, _VISA_DATA, _CITY_TO_COUNTRY, _RATES_TO_INR,
+    _REMOTE_WORK, _DAILY_TRANSPORT_INR,
+):
+    for _key in list(_table):
+        _table[sys.intern(_key)] = _table.pop(_key)
+del _table, _key
+
+# Freeze the activity pools — search_activities hands the shared tuple
+# out directly, so it must not be mutable.
+for _city in _CITY_ACTIVITIES:
+    _CITY_ACTIVITIES[_city] = tuple(_CITY_ACTIVITIES[_city])
+_DEFAULT_ACTIVITIES = tuple(_DEFAULT_ACTIVITIES)
+
+# Encode best_months as a 12-bit mask alongside the list — membership
+# tests become one AND (see month_mask); the list stays for display and
+# the response schema.
+for _profile in _WEATHER_PROFILES.values():
+    _profile['best_months_mask'] = sum(1 << _MONTH_IDX[_m] for _m in _profile['best_months'])
+del _profile
+
+# Merge the source tables into one CityRecord per city.  The tables
+# above stay as the human-editable data definition; everything on the
+# lookup path goes through _CITIES.
+for _city in (
+    _FLIGHT_BASES_INR.keys() | _HOTEL_BASES_INR.keys() | _CITY_ACTIVITIES.keys()
+    | _WEATHER_PROFILES.keys() | _CITY_TO_COUNTRY.keys() | _REMOTE_WORK.keys()
+    | _DAILY_TRANSPORT_INR.keys()
+):
+    _CITIES[_city] = CityRecord(
+        flight_base=_FLIGHT_BASES_INR.get(_city, 35000.0),
+        hotel_base=_HOTEL_BASES_INR.get(_city, 4500.0),
+        transport=_DAILY_TRANSPORT_INR.get(_city, 400.0),
+        weather=_WEATHER_PROFILES.get(_city),
+        visa_country=_CITY_TO_COUNTRY.get(_city, ''),
+        activities=_CITY_ACTIVITIES.get(_city, ()),
+        remote_spots=tuple(_REMOTE_WORK.get(_city, ())),
+    )
+del _city
+
+# Fold the currency divisions into a 15×15 cross-rate table (225
+# entries) — convert_currency then needs only one probe and a multiply.
+_CROSS.update({
+    (_a, _b): _ra / _rb
+    for _a, _ra in _RATES_TO_INR.items()
+    for _b, _rb in _RATES_TO_INR.items()
+})
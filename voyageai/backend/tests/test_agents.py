@@ -5,26 +5,77 @@ from app.agents.experience_agent import ExperienceAgent
 from app.agents.flight_intelligence_agent import FlightIntelligenceAgent
 from app.agents.hotel_intelligence_agent import HotelIntelligenceAgent
 from app.agents.planner_agent import PlannerAgent
-from app.schemas.travel import TravelRequest
+from app.schemas.travel import (
+    CarbonFootprint,
+    ConfidenceScores,
+    CostBreakdown,
+    TransportPlan,
+    UserIntent,
+    VisaInformation,
+)
 
+# Shared read-only slice of the graph state, built once for the module.
+# Per-test states merge over this template; only the containers the
+# agents append to (and the mutated CostBreakdown) are created fresh,
+# so parametrized cases don't rebuild the full dict each time.
+_BASE_STATE = {
+    'raw_prompt': '',
+    'weather_data': {},
+    'visa_data': {},
+    'transport_plan': TransportPlan(),
+    'visa_information': VisaInformation(),
+    'summary': '',
+    'route_strategy': '',
+    'carbon_footprint': CarbonFootprint(),
+    'confidence_scores': ConfidenceScores(),
+    'total_cost': 0.0,
+    'risk_score': 0.0,
+    'optimization_score': 0.0,
+    'optimization_summary': '',
+    'memory_context': '',
+}
 
-@pytest.mark.asyncio
-async def test_agent_chain_generates_costed_itinerary():
-    state = {
-        'request': TravelRequest(origin='SFO', destination='Tokyo', start_date='2026-06-01', end_date='2026-06-06', budget=3000),
+
+def _state_for(intent: UserIntent) -> dict:
+    return {
+        **_BASE_STATE,
+        'intent': intent,
         'flight_options': [],
         'hotel_options': [],
         'experiences': [],
-        'itinerary': [],
-        'total_cost': 0.0,
-        'risk_score': 0.0,
-        'optimization_summary': '',
+        'day_by_day_itinerary': [],
+        'stay_recommendations': [],
+        'cost_breakdown': CostBreakdown(),
+        'remote_work_spots': [],
+        'weather_insights': [],
         'logs': [],
-        'memory_context': '',
+        'validation_errors': [],
     }
-    for agent in [PlannerAgent(), FlightIntelligenceAgent(), HotelIntelligenceAgent(), ExperienceAgent(), BudgetOptimizerAgent()]:
-        state = await agent.run(state)
 
-    assert len(state['itinerary']) >= 3
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('destination', ['Tokyo', 'Goa'])
+async def test_agent_chain_generates_costed_itinerary(destination):
+    intent = UserIntent(
+        origin_city='Delhi',
+        destinations=[destination],
+        duration_days=5,
+        budget_total_inr=200000,
+    )
+    state = _state_for(intent)
+    for agent in [
+        PlannerAgent(),
+        FlightIntelligenceAgent(),
+        HotelIntelligenceAgent(),
+        ExperienceAgent(),
+        BudgetOptimizerAgent(),
+    ]:
+        # Parallel-branch agents return partial updates (the graph merges
+        # them); emulate that merge when chaining them serially here.
+        state.update(await agent.run(state))
+
+    assert len(state['day_by_day_itinerary']) == 5
+    assert state['flight_options'] and state['hotel_options']
     assert state['total_cost'] > 0
-    assert 'optimized under budget' in state['optimization_summary']
+    assert state['cost_breakdown'].total_estimated == state['total_cost']
+    assert 'Score:' in state['optimization_summary']
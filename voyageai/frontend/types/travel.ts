@@ -2,19 +2,21 @@
 // User Intent (extracted from natural language)
 // ---------------------------------------------------------------------------
 
+// Nullable fields may be omitted entirely by the streaming API
+// (the backend drops None-valued optionals), so treat absence as null.
 export type BudgetRange = {
-  min: number | null
-  max: number | null
+  min?: number | null
+  max?: number | null
 }
 
 export type UserIntent = {
-  origin_city: string | null
+  origin_city?: string | null
   destinations: string[]
-  country: string | null
+  country?: string | null
   duration_days: number
-  travel_month: string | null
-  travel_year: number | null
-  budget_total_inr: number | null
+  travel_month?: string | null
+  travel_year?: number | null
+  budget_total_inr?: number | null
   budget_range_inr: BudgetRange
   trip_type: string[]
   traveler_count: number